@@ -0,0 +1,142 @@
+"""
+In-process cache of article responses.
+
+Articles only change when a write to scraper.db commits, and every such
+write bumps the counter in the data_generation table (see
+data/writer.py), also when it is made by another process. A cached
+response is kept with the generation it was built at and served while
+the generation is unchanged, so entries never expire by time and are
+never stale. The cache is a bounded LRU keyed by route, query parameters
+and the current date (for "today" and days_back).
+
+Responses carry a strong ETag (a hash of the body) and
+``Cache-Control: no-cache``, so browsers revalidate on every poll and get
+a 304 Not Modified without a body while the data is unchanged.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, NamedTuple
+
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .database import run_in_db
+
+class CachedResponse(NamedTuple):
+    generation: int
+    body: bytes
+    media_type: str
+    etag: str
+
+    def response(self, request: Request) -> Response:
+        """The response for ``request``: 304 if the client already has this body."""
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Whether an If-None-Match header matches ``etag`` (weak comparison, as for GET)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+def current_generation(db: Session) -> int:
+    """The data generation of the database (see data/writer.bump_generation)."""
+    return db.execute(text("SELECT generation FROM data_generation")).scalar() or 0
+
+class ResponseCache:
+    """
+    Bounded LRU of response bodies, each valid for one data generation.
+
+    An entry built at an older generation is replaced on its next lookup;
+    entries nobody asks for again are evicted once ``max_entries`` is
+    exceeded.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0, "not_modified": 0}
+        self._generation = None
+
+    def lookup(self, key: tuple, generation: int):
+        """Get the cached response for ``key`` if it was built at ``generation``."""
+        with self._lock:
+            self._generation = generation
+            entry = self._entries.get(key)
+            if entry is not None and entry.generation == generation:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            if entry is not None:
+                self._stats["invalidations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+    def store(self, key: tuple, generation: int, response: Response) -> CachedResponse:
+        """Cache a response built at ``generation`` and return the entry."""
+        body = bytes(response.body)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = CachedResponse(generation, body, response.media_type, etag)
+        with self._lock:
+            current = self._entries.get(key)
+            # A slower request may finish after the data changed again; keep the newer entry
+            if current is None or current.generation <= generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return entry
+
+    def not_modified(self):
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters, the number of entries and the last generation seen"""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self._generation,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+response_cache = ResponseCache()
+
+async def cached_response(request: Request, read: Callable[[Session], Response]) -> Response:
+    """
+    Serve a GET endpoint through the response cache.
+
+    ``read(db)`` builds the response and is only called when there is no
+    entry for the request at the current data generation. Like all
+    database work it runs on a run_in_db thread.
+
+    Returns:
+        Response: The cached body with its ETag, or 304 if the client has it
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), date.today())
+
+    def read_cached(db: Session) -> CachedResponse:
+        generation = current_generation(db)
+        entry = response_cache.lookup(key, generation)
+        if entry is None:
+            entry = response_cache.store(key, generation, read(db))
+        return entry
+
+    response = (await run_in_db(read_cached)).response(request)
+    if response.status_code == 304:
+        response_cache.not_modified()
+    return response
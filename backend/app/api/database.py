@@ -1,31 +1,81 @@
 """
 Database connection and session management for the API.
 This module handles SQLAlchemy database connections and sessions.
+
+The API endpoints are async, but SQLite and its driver are blocking, so
+endpoints never query on the event loop: they hand their queries to
+``run_in_db``, which runs them on a small, dedicated thread pool. Each
+worker thread checks its own connection out of the engine's pool, so the
+pool is sized to the number of workers.
 """
 
-from sqlalchemy import create_engine
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from pathlib import Path
+from sqlalchemy.orm import Session, sessionmaker
+
+from .metrics import current_query_stats
 
-# Database URL - using SQLite for now
+try:
+    from ..config.database_config import DB_PATH
+    from ..data.tiering import attach_cold
+    from ..data.writer import BUSY_TIMEOUT
+except ImportError:
+    # Fallback for when imported as the top-level api package (api/init_db.py)
+    from config.database_config import DB_PATH
+    from data.tiering import attach_cold
+    from data.writer import BUSY_TIMEOUT
+
+# Database URL - using SQLite for now (DB_PATH honours SCRAPER_DB_PATH)
 # In production, you might want to use PostgreSQL or MySQL
-DB_PATH = str(Path(__file__).parent.parent / "data" / "scraper.db")
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Threads running database work for the async endpoints (one connection each)
+DB_WORKERS = int(os.environ.get("API_DB_WORKERS", 8))
+# Extra connections for code using sessions outside run_in_db (get_db dependency, scripts)
+DB_EXTRA_CONNECTIONS = 4
+
 # Create the SQLAlchemy engine
-# connect_args is needed for SQLite
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    # check_same_thread is needed for SQLite; readers wait for locks like the scraper does
+    connect_args={"check_same_thread": False, "timeout": BUSY_TIMEOUT},
+    pool_size=DB_WORKERS,
+    max_overflow=DB_EXTRA_CONNECTIONS,
+    pool_timeout=30,
 )
 
+@event.listens_for(engine, "connect")
+def attach_cold_tier(dbapi_connection, connection_record):
+    """Make articles moved to the cold tier readable on every connection"""
+    attach_cold(dbapi_connection, DB_PATH)
+
+@event.listens_for(engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+@event.listens_for(engine, "after_cursor_execute")
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    """Add the query to the current request's database time (see metrics.py)"""
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(time.perf_counter() - context._query_start)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class
 Base = declarative_base()
 
+# Threads for run_in_db; a worker never waits for a connection, as the pool has one per worker
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
 # Dependency to get database session
 def get_db():
     """
@@ -36,4 +86,30 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def call_with_session(fn, *args, **kwargs):
+    """Call ``fn(session, *args, **kwargs)`` with a new session, closing it afterwards."""
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+async def run_in_db(fn, *args, **kwargs):
+    """
+    Run blocking database work off the event loop.
+
+    ``fn`` is called as ``fn(session, *args, **kwargs)`` on a db_executor
+    thread with a session of its own, closed when it returns. At most
+    DB_WORKERS calls run at once; further calls queue without blocking
+    the event loop. The caller's context variables are visible to ``fn``.
+
+    Returns:
+        Whatever ``fn`` returns (exceptions are raised in the caller)
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        db_executor, context.run, partial(call_with_session, fn, *args, **kwargs)
+    )
@@ -0,0 +1,174 @@
+"""
+Push notifications of newly scraped articles over Server-Sent Events.
+
+One ArticleBroadcaster per API process watches the data generation (see
+api/cache.py): a single query every POLL_INTERVAL seconds however many
+clients are connected, which also sees scrapes run by another process.
+When the generation moves, the articles added since the last one it saw
+are read once (at most REPLAY_LIMIT per poll; the rest on the next),
+encoded once as an SSE "articles" event and handed to every subscriber.
+While nobody is subscribed it only moves its position to the newest
+article, so the first subscriber after a quiet spell does not make it
+read everything added meanwhile.
+
+The id of an event is the highest article id in it, so a reconnecting
+EventSource sends it back as Last-Event-ID and is replayed just the
+articles it missed. If it missed more than REPLAY_LIMIT, it gets a
+"reset" event instead and should reload its lists.
+"""
+
+import asyncio
+import json
+import logging
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .cache import current_generation
+from .database import run_in_db
+from .models import Article, Source
+from .serializers import ARTICLE_FIELDS, article_columns, article_rows, article_rows_adapter
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 1.0
+KEEPALIVE_INTERVAL = 15.0
+# Articles per event, and the most a reconnecting client is replayed
+EVENT_BATCH_SIZE = 200
+REPLAY_LIMIT = 1000
+# Events a subscriber may fall behind before its stream is closed (it resumes on reconnect)
+SUBSCRIBER_QUEUE_SIZE = 32
+RETRY_MILLISECONDS = 3000
+# Everything but the full text, which clients fetch with /articles/{id}
+EVENT_FIELDS = tuple(field for field in ARTICLE_FIELDS if field != "content")
+
+def format_event(event: str, event_id: Optional[int], data: bytes) -> bytes:
+    """Encode one SSE message (data is a single line of JSON)."""
+    lines = [f"event: {event}".encode()]
+    if event_id is not None:
+        lines.append(f"id: {event_id}".encode())
+    lines.append(b"data: " + data)
+    return b"\n".join(lines) + b"\n\n"
+
+def articles_event(rows: list) -> bytes:
+    body = b'{"articles":' + article_rows_adapter.dump_json(article_rows(rows, EVENT_FIELDS, with_snippet=False)) + b"}"
+    return format_event("articles", rows[-1].id, body)
+
+def reset_event(last_id: int) -> bytes:
+    return format_event("reset", last_id, json.dumps({"last_id": last_id}).encode())
+
+def read_articles_after(db: Session, after_id: int, limit: int) -> list:
+    """Up to ``limit`` articles with an id above ``after_id``, in id order."""
+    return db.query(*article_columns(EVENT_FIELDS)).outerjoin(Source, Source.id == Article.source_id).filter(
+        Article.id > after_id
+    ).order_by(Article.id).limit(limit).all()
+
+def read_last_id(db: Session) -> int:
+    return db.query(func.max(Article.id)).scalar() or 0
+
+class ArticleBroadcaster:
+    """Fans "articles" events out to the queues of all subscribed streams."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._task = None
+        self._generation = None
+        self.last_id = 0
+
+    def start(self):
+        """Start watching for new articles (call from the event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop watching and end every subscribed stream."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for queue in list(self._subscribers):
+            self._close(queue)
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Subscribe to new articles.
+
+        Returns:
+            asyncio.Queue: Receives (rows, encoded event) tuples, the rows
+                in id order (the event id is the last one's), and None
+                when the stream should end
+        """
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, rows: list, event: bytes):
+        """Hand an encoded event to every subscriber; ones that fell too far behind are closed."""
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((rows, event))
+            except asyncio.QueueFull:
+                self._close(queue)
+
+    def _close(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _run(self):
+        self.last_id = await run_in_db(read_last_id)
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                await self._poll()
+            except Exception:
+                # A failed poll is retried on the next tick; the stream stays open
+                logger.exception("Polling for new articles failed")
+
+    async def _poll(self):
+        listening = bool(self._subscribers)
+        generation, last_id, batches = await run_in_db(
+            self._read_changes, self._generation, self.last_id, listening
+        )
+        if not listening and self._subscribers:
+            # Someone subscribed during an idle poll: do not skip what they may need
+            return
+        self._generation = generation
+        self.last_id = last_id
+        for rows in batches:
+            self.publish(rows, articles_event(rows))
+
+    @staticmethod
+    def _read_changes(db: Session, seen_generation: Optional[int], after_id: int, listening: bool):
+        """The generation seen, the id read up to and, if anyone is listening, the new articles in batches."""
+        generation = current_generation(db)
+        batches: List[list] = []
+        if generation == seen_generation:
+            return generation, after_id, batches
+        if not listening:
+            # Nobody to send them to; the next subscriber starts from the newest article
+            return generation, read_last_id(db), batches
+        read = 0
+        while read < REPLAY_LIMIT:
+            rows = read_articles_after(db, after_id, EVENT_BATCH_SIZE)
+            if rows:
+                batches.append(rows)
+                after_id = rows[-1].id
+                read += len(rows)
+            if len(rows) < EVENT_BATCH_SIZE:
+                return generation, after_id, batches
+        # More than a poll reads: leave the generation unseen, so the next poll continues
+        return seen_generation, after_id, batches
+
+broadcaster = ArticleBroadcaster()
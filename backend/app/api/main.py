@@ -3,13 +3,31 @@ Main FastAPI application for the Next Step App backend.
 This file creates the FastAPI app and includes all the routers.
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 # Import our routers (we'll create these next)
-from .routers import articles, scheduler, health
+from .routers import articles, events, scheduler, health
+from .database import DB_PATH
+from .cache import response_cache
+from .events import broadcaster
+from .metrics import Counter, Gauge, MetricsMiddleware, render_metrics
+from ..data.migrations import migrate
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bring the database schema up to date before serving requests, push new articles while serving
+    and take part in the election of the worker that runs the scheduler."""
+    migrate(DB_PATH)
+    broadcaster.start()
+    scheduler.leader.start()
+    yield
+    await run_in_threadpool(scheduler.leader.stop)
+    await broadcaster.stop()
 
 # Create the FastAPI application
 app = FastAPI(
@@ -17,7 +35,8 @@ app = FastAPI(
     description="API for scraping and managing UK immigration news",
     version="1.0.0",
     docs_url="/docs",  # Swagger UI documentation
-    redoc_url="/redoc"  # ReDoc documentation
+    redoc_url="/redoc",  # ReDoc documentation
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow frontend to communicate with backend
@@ -29,10 +48,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every request by route, with its database queries (outermost, so it sees everything)
+app.add_middleware(MetricsMiddleware)
+
 # Include our API routers
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(articles.router, prefix="/api/v1", tags=["articles"])
 app.include_router(scheduler.router, prefix="/api/v1", tags=["scheduler"])
+app.include_router(events.router, prefix="/api/v1", tags=["events"])
 
 # Root endpoint
 @app.get("/")
@@ -45,6 +68,21 @@ async def root():
         "health": "/api/v1/health"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Request, database, response cache and push metrics in the Prometheus text format."""
+    cache_stats = response_cache.stats()
+    cache_hits = Counter("api_response_cache_hits_total", "Responses served from the response cache.")
+    cache_hits.inc(amount=cache_stats["hits"])
+    cache_misses = Counter("api_response_cache_misses_total", "Responses built because they were not cached.")
+    cache_misses.inc(amount=cache_stats["misses"])
+    subscribers = Gauge("api_event_subscribers", "Open /events streams.")
+    subscribers.set(broadcaster.subscriber_count())
+    return Response(
+        render_metrics((cache_hits, cache_misses, subscribers)),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 # Run the application
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,192 @@
+"""
+Request and database metrics in the Prometheus text format.
+
+``MetricsMiddleware`` is a plain ASGI middleware (no per-request task or
+response wrapping) that times every HTTP request by route template, so
+/articles/{article_id} is one series however many ids are requested, and
+counts the requests in flight. For the duration of a request it also
+puts a QueryStats in ``current_query_stats``; the engine events in
+database.py add every query's time to it, and run_in_db carries it to
+the worker threads. The number of queries per request is recorded per
+route, which makes an N+1 query pattern show up as a shift in its
+histogram.
+
+Metrics are only updated on the event loop thread, so they need no locks.
+Streaming responses (export, events) are timed until they end.
+
+Every process keeps its own metrics. With several workers
+(``run_api.py --production``) each scrape of /metrics is answered by
+whichever worker accepts the connection and shows that worker's counts
+only, so every series carries a ``worker`` label with the process id:
+a counter then never appears to go backwards when a different worker
+answers, and a worker's restart shows up as a new series rather than a
+counter reset. Sum over ``worker`` for the totals, e.g.
+``sum without (worker) (rate(http_requests_total[5m]))``; a worker only
+contributes once it has answered a scrape.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+# Seconds, as in the Prometheus client defaults, plus 1 ms for cached responses
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "unmatched"
+
+class QueryStats:
+    """Number and total time of the database queries of one request."""
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    # Read per call: a forked worker must not report its parent's pid
+    pairs = [f'worker="{os.getpid()}"']
+    pairs.extend(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+class Counter:
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, values: tuple = (), amount: float = 1):
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{format_labels(self.labels, values)} {value}")
+        return lines
+
+class Gauge(Counter):
+    def dec(self, values: tuple = (), amount: float = 1):
+        self.inc(values, -amount)
+
+    def set(self, value: float, values: tuple = ()):
+        self._values[values] = value
+
+    def render(self) -> list:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        if not self._values and not self.labels:
+            lines.append(f"{self.name}{format_labels((), ())} 0")
+        return lines
+
+class Histogram:
+    """A histogram per label set; bucket counts are kept per bucket and summed when rendered."""
+
+    def __init__(self, name: str, description: str, buckets: tuple, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+
+    def observe(self, values: tuple, value: float):
+        series = self._series.get(values)
+        if series is None:
+            # Counts per bucket (the last one is +Inf), sum, count
+            series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, values)} {total}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, values)} {count}")
+        return lines
+
+requests_total = Counter(
+    "http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status")
+)
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being served.")
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", LATENCY_BUCKETS, ("method", "route")
+)
+request_queries = Histogram(
+    "http_request_db_queries", "Database queries per HTTP request by route.", QUERY_COUNT_BUCKETS, ("route",)
+)
+request_query_duration = Histogram(
+    "http_request_db_duration_seconds", "Database time per HTTP request by route.", LATENCY_BUCKETS, ("route",)
+)
+METRICS = (requests_total, requests_in_flight, request_duration, request_queries, request_query_duration)
+
+def route_template(scope: dict) -> str:
+    """The path template of the route that handled a request (set by the router)."""
+    template = getattr(scope.get("route"), "path_format", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    # The route of an included router may only know its own path; its prefix
+    # (e.g. /api/v1) has no parameters, so it is the start of the request path
+    parts = scope["path"].split("/")
+    prefix = "/".join(parts[:max(len(parts) - template.count("/"), 0)])
+    return prefix + template
+
+class MetricsMiddleware:
+    """Record latency, status, in-flight count and database queries of HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        queries = QueryStats()
+        token = current_query_stats.set(queries)
+        requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            requests_in_flight.dec()
+            current_query_stats.reset(token)
+            route = route_template(scope)
+            method = scope["method"]
+            requests_total.inc((method, route, status))
+            request_duration.observe((method, route), elapsed)
+            request_queries.observe((route,), queries.count)
+            request_query_duration.observe((route,), queries.seconds)
+
+def render_metrics(extra: tuple = ()) -> str:
+    """All metrics, plus ``extra`` ones, in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    for metric in METRICS + tuple(extra):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
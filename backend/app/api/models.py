@@ -1,11 +1,12 @@
 """
 SQLAlchemy models for the Next Step App database.
-These models define the structure of our database tables.
+These models define the structure of our database tables. The tables and
+indexes themselves are created by app/data/migrations.py.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Date, LargeBinary, func
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime
 
 # Create the base class for all models
@@ -27,6 +28,11 @@ class Source(Base):
     subtitle_selector = Column(String)
     date_selector = Column(String)
     last_scraped = Column(DateTime, default=datetime.utcnow)
+    etag = Column(String)
+    last_modified = Column(String)
+    content_hash = Column(String)
+    hwm_date_published = Column(DateTime)
+    hwm_article_url = Column(String)
     
     # Relationship to articles
     articles = relationship("Article", back_populates="source")
@@ -47,4 +53,35 @@ class Article(Base):
     content = Column(Text)
     
     # Relationship to source
-    source = relationship("Source", back_populates="articles") 
\ No newline at end of file
+    source = relationship("Source", back_populates="articles") 
+
+class ColdArticle(Base):
+    """
+    Model representing an article moved to the cold tier
+    (the attached scraper_cold.db, see app/data/tiering.py)
+    """
+    __tablename__ = "articles"
+    __table_args__ = {"schema": "cold"}
+    
+    id = Column(Integer, primary_key=True)
+    source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
+    article_url = Column(String, unique=True, nullable=False)
+    title = Column(String, nullable=False)
+    subtitle = Column(Text)
+    date_published = Column(DateTime)
+    date_fetched = Column(DateTime)
+    compressed_content = Column("content", LargeBinary)
+    # Stored zlib-compressed; inflate() is registered on every connection
+    content = column_property(func.inflate(compressed_content))
+
+class ArticleCount(Base):
+    """
+    Rollup of articles published and fetched per day and source,
+    maintained by triggers on the articles table
+    """
+    __tablename__ = "article_counts"
+    
+    day = Column(Date, primary_key=True)
+    source_id = Column(Integer, ForeignKey("sources.id"), primary_key=True)
+    published = Column(Integer, nullable=False, default=0)
+    fetched = Column(Integer, nullable=False, default=0)
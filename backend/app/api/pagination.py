@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination helpers for the articles list.
+
+A cursor is an opaque, URL-safe token holding the (date_published, id) of
+the last article on a page. The next page continues strictly after it in
+the list order (date_published DESC, id ASC), which the
+idx_articles_published / idx_articles_source_published indexes serve
+directly, so every page costs the same however deep it is.
+"""
+
+import base64
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.orm import Session
+
+from .cache import current_generation
+from .models import Article
+
+def encode_cursor(date_published: datetime, article_id: int) -> str:
+    """Encode the position after an article as an opaque cursor."""
+    payload = json.dumps([date_published.isoformat(sep=" "), article_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Returns:
+        tuple: The date as stored by the scraper ("YYYY-MM-DD HH:MM:SS") and the id
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_published, article_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.fromisoformat(date_published)
+        return date_published, int(article_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+def after_cursor(cursor: str, model=Article):
+    """
+    SQLAlchemy filter for the articles after a cursor in list order.
+
+    Articles without a publish date sort after every dated one and are not
+    reachable through cursors (the scraper only stores dated articles).
+    ``model`` is Article or ColdArticle, for the tier being filtered.
+    """
+    date_published, article_id = decode_cursor(cursor)
+    # Compare with the stored text as is; binding a datetime would add microseconds
+    stored_date = type_coerce(model.date_published, String)
+    # The OR alone gives SQLite no range on date_published, so it scans the
+    # date index from the newest article on; the redundant upper bound lets
+    # it seek straight to the cursor (benchmarks/bench_pagination.py)
+    return and_(
+        stored_date <= date_published,
+        or_(
+            stored_date < date_published,
+            and_(stored_date == date_published, model.id > article_id),
+        ),
+    )
+
+def next_cursor(articles: list, per_page: int) -> Optional[str]:
+    """Cursor for the page after ``articles``, or None if this was the last page."""
+    if len(articles) < per_page or articles[-1].date_published is None:
+        return None
+    return encode_cursor(articles[-1].date_published, articles[-1].id)
+
+class TotalCache:
+    """
+    Cache of filtered article counts.
+
+    A count is reused while the data generation it was taken at is current
+    (no write, be it an insert, a delete or a move between tiers, has
+    committed since), so repeated list requests do not run COUNT(*) over
+    the filtered set. Keys hold the computed cutoff date rather than
+    days_back, so a count does not outlive the day it was taken for.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counts = OrderedDict()
+
+    def get(self, db: Session, key: tuple, count) -> int:
+        """Get the count for ``key``, calling ``count()`` if it is missing or stale."""
+        generation = current_generation(db)
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached and cached[1] == generation:
+                self._counts.move_to_end(key)
+                return cached[0]
+
+        total = count()
+        with self._lock:
+            self._counts[key] = (total, generation)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+article_totals = TotalCache()
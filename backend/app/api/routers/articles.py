@@ -3,76 +3,203 @@ Articles router for managing scraped articles.
 This router provides endpoints to view, search, and manage articles.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import String, column, desc, exists, func, literal_column, null, table, type_coerce, union_all
 from typing import Optional, List
-from datetime import datetime, timedelta
-from ..database import get_db
-from ..models import Article, Source
+from datetime import date, datetime, timedelta, timezone
+import re
+import zlib
+from ..cache import cached_response
+from ..database import run_in_db
+from ..models import Article, ArticleCount, ColdArticle, Source
+from ..pagination import after_cursor, article_totals, decode_cursor, next_cursor
 from ..schemas import Article as ArticleSchema, ArticleList
+from ..serializers import (ARTICLE_FIELDS, article_adapter, article_columns, article_csv, article_list_adapter,
+                           article_ndjson, article_rows, article_rows_adapter, json_response, parse_fields)
 
 router = APIRouter()
 
+# Full-text indexes over title, subtitle and content of the hot and the cold tier
+# (see data/migrations.py and data/tiering.py), and the name to MATCH each by
+articles_fts = table("articles_fts", column("rowid"))
+FTS_TABLE = literal_column("articles_fts")
+cold_articles_fts = table("articles_fts", column("rowid"), schema="cold").alias("cold_fts")
+FTS_TABLES = {
+    Article: (articles_fts, FTS_TABLE),
+    # Qualified by the alias, as both tables are named articles_fts
+    ColdArticle: (cold_articles_fts, literal_column("cold_fts.articles_fts")),
+}
+SEARCH_TOKEN_RE = re.compile(r'"([^"]*)"?|(\S+)')
+SNIPPET_TOKENS = 16
+# Rows read and encoded per database call while exporting
+EXPORT_BATCH_SIZE = 500
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+FIELDS_DESCRIPTION = f"Comma-separated fields to return, e.g. id,title,date_published ({', '.join(ARTICLE_FIELDS)})"
+
+def fts_query(search: str) -> Optional[str]:
+    """
+    Turn a user search string into a safe FTS5 query.
+    
+    Words are matched (with stemming) in any order; "double quoted" text is
+    matched as a phrase and a trailing * makes a word a prefix match. Any
+    other FTS5 syntax in the input is treated as plain text.
+    
+    Returns:
+        str: FTS5 MATCH expression, or None if the search has no words
+    """
+    terms = []
+    for phrase, word in SEARCH_TOKEN_RE.findall(search):
+        words = re.findall(r'\w+', phrase or word)
+        if not words:
+            continue
+        if phrase:
+            terms.append('"' + ' '.join(words) + '"')
+        else:
+            prefix = '*' if word.endswith('*') else ''
+            terms.extend(f'"{w}"' for w in words[:-1])
+            terms.append(f'"{words[-1]}"{prefix}')
+    return ' '.join(terms) or None
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (a q-value of 0 refuses it)."""
+    q_values = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        q_values[coding.strip().lower()] = q
+    return q_values.get("gzip", q_values.get("*", 0.0)) > 0
+
+def requested_fields(fields: Optional[str]) -> tuple:
+    """Parse the fields= parameter, answering 400 for unknown fields."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def select_articles(db: Session, fields: tuple, model=Article):
+    """Query selecting only the columns for ``fields``, with the source joined if needed."""
+    query = db.query(*article_columns(fields, model))
+    if "source" in fields:
+        query = query.outerjoin(Source, Source.id == model.source_id)
+    return query
+
+def needs_cold_tier(db: Session, cutoff_date: Optional[date]) -> bool:
+    """Whether articles in the cold tier can match a list published on or after ``cutoff_date``."""
+    newest = db.query(func.max(ColdArticle.date_published)).scalar()
+    return newest is not None and (cutoff_date is None or newest.date() >= cutoff_date)
+
+def filter_tier(query, model, cutoff_date: Optional[date], source_id: Optional[int]):
+    """Apply the days_back and source_id filters to a query over one tier (Article or ColdArticle)."""
+    if model is ColdArticle:
+        # An article caught mid-move is read from the hot tier
+        query = query.filter(~exists().where(Article.id == ColdArticle.id))
+    
+    if cutoff_date:
+        query = query.filter(model.date_published >= cutoff_date)
+    
+    if source_id:
+        query = query.filter(model.source_id == source_id)
+    
+    return query
+
+def search_tier(query, model, match: str):
+    """Restrict a query over one tier to the articles its full-text index matches."""
+    fts, fts_table = FTS_TABLES[model]
+    return query.join(fts, fts.c.rowid == model.id).filter(fts_table.op("MATCH")(match))
+
 @router.get("/articles/recent", response_model=List[ArticleSchema])
 async def get_recent_articles(
+    request: Request,
     limit: int = Query(10, ge=1, le=50, description="Number of recent articles"),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Get the most recent articles.
     
     Args:
+        request: The request (keys the response cache, carries If-None-Match)
         limit: Number of articles to return (max 50)
-        db: Database session
+        fields: Comma-separated article fields to return (default: all)
     
     Returns:
         List[Article]: List of recent articles
     """
-    articles = db.query(Article).order_by(
-        desc(Article.date_fetched)
-    ).limit(limit).all()
-    return [ArticleSchema.model_validate(article.__dict__) for article in articles]
+    fields = requested_fields(fields)
+    
+    def read(db: Session):
+        rows = select_articles(db, fields).order_by(
+            desc(Article.date_fetched)
+        ).limit(limit).all()
+        return json_response(article_rows_adapter, article_rows(rows, fields))
+    
+    return await cached_response(request, read)
 
 @router.get("/articles/today", response_model=List[ArticleSchema])
-async def get_todays_articles(db: Session = Depends(get_db)):
+async def get_todays_articles(
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Get articles published today.
     
     Args:
-        db: Database session
+        request: The request (keys the response cache, carries If-None-Match)
+        fields: Comma-separated article fields to return (default: all)
     
     Returns:
         List[Article]: List of today's articles
     """
+    fields = requested_fields(fields)
     today = datetime.now().date()
-    articles = db.query(Article).filter(
-        Article.date_published == today
-    ).order_by(desc(Article.date_fetched)).all()
-    return [ArticleSchema.model_validate(article.__dict__) for article in articles]
+    # Published dates are stored as "YYYY-MM-DD HH:MM:SS" text; compare as text so the index applies
+    stored_date = type_coerce(Article.date_published, String)
+    
+    def read(db: Session):
+        rows = select_articles(db, fields).filter(
+            stored_date >= str(today), stored_date < str(today + timedelta(days=1))
+        ).order_by(desc(Article.date_fetched)).all()
+        return json_response(article_rows_adapter, article_rows(rows, fields))
+    
+    return await cached_response(request, read)
 
 @router.get("/articles/stats")
-async def get_article_stats(db: Session = Depends(get_db)):
+async def get_article_stats(request: Request):
     """
     Get statistics about articles.
     
+    Reads the article_counts rollup (one row per day and source) instead
+    of scanning the articles table, and is cached until articles change.
+    
     Args:
-        db: Database session
+        request: The request (keys the response cache, carries If-None-Match)
     
     Returns:
         dict: Article statistics
     """
-    total_articles = db.query(Article).count()
+    return await cached_response(request, lambda db: JSONResponse(read_article_stats(db)))
+
+def read_article_stats(db: Session) -> dict:
+    total_articles = db.query(func.coalesce(func.sum(ArticleCount.fetched), 0)).scalar()
     today = datetime.now().date()
-    todays_articles = db.query(Article).filter(
-        Article.date_published == today
-    ).count()
+    todays_articles = db.query(func.coalesce(func.sum(ArticleCount.published), 0)).filter(
+        ArticleCount.day == today
+    ).scalar()
     
     # Articles by source
+    count = func.sum(ArticleCount.fetched)
     source_stats = db.query(
         Source.label,
-        func.count(Article.id).label('count')
-    ).join(Article).group_by(Source.label).all()
+        count.label('count')
+    ).join(ArticleCount, ArticleCount.source_id == Source.id).group_by(Source.label).having(count > 0).all()
     
     return {
         "total_articles": total_articles,
@@ -83,70 +210,280 @@ async def get_article_stats(db: Session = Depends(get_db)):
         ]
     }
 
+@router.get("/articles/stats/daily")
+async def get_daily_article_stats(
+    days: int = Query(30, ge=1, le=366, description="Number of days up to and including end_date"),
+    end_date: Optional[date] = Query(None, description="Last day of the range (default: today)"),
+    by: str = Query("published", pattern="^(published|fetched)$", description="Count by publish or fetch day"),
+    source_id: Optional[int] = Query(None, description="Only count this source"),
+    per_source: bool = Query(False, description="Break each day down by source")
+):
+    """
+    Get article counts per day over a date range.
+    
+    Served from the article_counts rollup, so the cost depends on the
+    number of days and sources, not on the number of articles. Days
+    without articles are included with a count of 0.
+    
+    Args:
+        days: Length of the range in days (max 366)
+        end_date: Last day of the range (default: today)
+        by: "published" to count by publish date, "fetched" by fetch date
+        source_id: Filter by specific source
+        per_source: Include per-source counts for every day
+    
+    Returns:
+        dict: The range and one entry per day, oldest first
+    """
+    end_date = end_date or datetime.now().date()
+    start_date = end_date - timedelta(days=days - 1)
+    count_column = getattr(ArticleCount, by)
+    
+    def read(db: Session):
+        query = db.query(ArticleCount.day, ArticleCount.source_id, count_column).filter(
+            ArticleCount.day >= start_date, ArticleCount.day <= end_date, count_column > 0
+        )
+        if source_id:
+            query = query.filter(ArticleCount.source_id == source_id)
+        return query.all()
+    
+    daily = {start_date + timedelta(days=i): {"count": 0, "sources": {}} for i in range(days)}
+    for day, day_source_id, day_count in await run_in_db(read):
+        daily[day]["count"] += day_count
+        daily[day]["sources"][day_source_id] = day_count
+    
+    result_days = []
+    for day, counts in daily.items():
+        entry = {"date": day, "count": counts["count"]}
+        if per_source:
+            entry["by_source"] = [
+                {"source_id": day_source_id, "count": day_count}
+                for day_source_id, day_count in sorted(counts["sources"].items())
+            ]
+        result_days.append(entry)
+    
+    return {
+        "by": by,
+        "start_date": start_date,
+        "end_date": end_date,
+        "total": sum(entry["count"] for entry in result_days),
+        "days": result_days
+    }
+
 @router.get("/articles", response_model=ArticleList)
 async def get_articles(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Articles per page"),
     days_back: Optional[int] = Query(None, description="Filter articles from last N days"),
     source_id: Optional[int] = Query(None, description="Filter by source ID"),
-    search: Optional[str] = Query(None, description="Search in title and subtitle"),
-    db: Session = Depends(get_db)
+    search: Optional[str] = Query(None, description="Full-text search in title, subtitle and content"),
+    cursor: Optional[str] = Query(None, description="Continue after this next_cursor instead of using page"),
+    include_total: Optional[bool] = Query(None, description="Include the total count (default: only without cursor)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Get a paginated list of articles with optional filtering.
     
+    Articles are listed newest first. Pages can be addressed by number
+    (page/per_page) or, in constant time however deep, by passing the
+    next_cursor of the previous response as cursor. The total count is
+    served from a cache that is refreshed when articles are added.
+    Articles moved to the cold tier (see data/tiering.py) are listed
+    after the hot ones they are older than, and searched as well.
+    Responses are cached until articles change and carry an ETag, so an
+    unchanged page costs the client a 304 (see api/cache.py).
+    
     Args:
-        page: Page number (starts from 1)
+        request: The request (keys the response cache, carries If-None-Match)
+        page: Page number (starts from 1); ignored when cursor is given
         per_page: Number of articles per page (max 100)
         days_back: Filter articles from last N days
         source_id: Filter by specific source
-        search: Search term for title and subtitle
-        db: Database session
+        search: Full-text search in title, subtitle and content; results are
+            ranked by relevance (BM25) and carry a highlighted snippet
+            (except those in the cold tier, whose index keeps no text)
+        cursor: Opaque position from a previous response's next_cursor
+        include_total: Whether to return total (defaults to true for page
+            numbers and false for cursors)
+        fields: Comma-separated article fields to return (default: all),
+            e.g. to leave out content
     
     Returns:
         ArticleList: Paginated list of articles
+    
+    Raises:
+        HTTPException: If the cursor or fields are invalid, or cursor is
+            combined with search
     """
-    # Build query
-    query = db.query(Article).join(Source)
+    fields = requested_fields(fields)
+    match = fts_query(search) if search else None
+    if cursor and match:
+        raise HTTPException(status_code=400, detail="cursor cannot be combined with search")
+    if include_total is None:
+        include_total = cursor is None
+    try:
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Apply filters
-    if days_back:
-        cutoff_date = datetime.now().date() - timedelta(days=days_back)
-        query = query.filter(Article.date_published >= cutoff_date)
+    cutoff_date = datetime.now().date() - timedelta(days=days_back) if days_back else None
     
-    if source_id:
-        query = query.filter(Article.source_id == source_id)
+    def tier_query(db: Session, model):
+        # Build query: only the requested columns, source joined in the same query
+        query = db.query(*article_columns(fields, model)).outerjoin(Source, Source.id == model.source_id)
+        return filter_tier(query, model, cutoff_date, source_id)
     
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Article.title.contains(search_term)) |
-            (Article.subtitle.contains(search_term))
-        )
+    def read(db: Session):
+        total = None
+        cursor_after = None
+        if match:
+            models = [Article, ColdArticle] if needs_cold_tier(db, cutoff_date) else [Article]
+            tiers = [search_tier(tier_query(db, model), model, match) for model in models]
+            if include_total:
+                total = article_totals.get(
+                    db, (cutoff_date, source_id, match), lambda: sum(tier.count() for tier in tiers)
+                )
+            
+            ranked = []
+            for tier, model in zip(tiers, models):
+                fts_table = FTS_TABLES[model][1]
+                # The cold tier's index is contentless, so there is no text to cut a snippet from
+                snippet = null() if model is ColdArticle else func.snippet(
+                    fts_table, -1, "<mark>", "</mark>", "…", SNIPPET_TOKENS
+                )
+                ranked.append(tier.add_columns(
+                    snippet.label("snippet"), func.bm25(fts_table).label("relevance")
+                ).statement)
+            statement = ranked[0] if len(ranked) == 1 else union_all(*ranked)
+            statement = statement.order_by(literal_column("relevance"), desc(literal_column("date_published")))
+            rows = db.execute(statement.offset((page - 1) * per_page).limit(per_page)).all()
+        else:
+            # Older articles continue in the cold tier; both are merged in list order
+            models = [Article, ColdArticle] if needs_cold_tier(db, cutoff_date) else [Article]
+            tiers = [tier_query(db, model) for model in models]
+            if include_total:
+                total = article_totals.get(
+                    db, (cutoff_date, source_id, match), lambda: sum(tier.count() for tier in tiers)
+                )
+            
+            if cursor:
+                tiers = [tier.filter(after_cursor(cursor, model)) for tier, model in zip(tiers, models)]
+            statement = tiers[0].statement if len(tiers) == 1 else union_all(*(tier.statement for tier in tiers))
+            # id ascending breaks date ties in the order the date indexes store them
+            statement = statement.order_by(desc(literal_column("date_published")), literal_column("id"))
+            if not cursor:
+                statement = statement.offset((page - 1) * per_page)
+            rows = db.execute(statement.limit(per_page)).all()
+            cursor_after = next_cursor(rows, per_page)
+        
+        return json_response(article_list_adapter, {
+            "articles": article_rows(rows, fields),
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "next_cursor": cursor_after,
+        })
+    
+    return await cached_response(request, read)
+
+@router.get("/articles/export")
+async def export_articles(
+    request: Request,
+    export_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson (one JSON article per line) or csv"
+    ),
+    days_back: Optional[int] = Query(None, description="Filter articles from last N days"),
+    source_id: Optional[int] = Query(None, description="Filter by source ID"),
+    search: Optional[str] = Query(None, description="Full-text search in title, subtitle and content"),
+    since: Optional[datetime] = Query(None, description="Only articles fetched after this time"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    """
+    Stream every matching article, for full or incremental dumps.
+    
+    Articles are read in id order, EXPORT_BATCH_SIZE at a time, each batch
+    continuing after the last id of the previous one, and every batch is
+    encoded and sent before the next is read. Memory use does not grow
+    with the number of articles, and no connection or read transaction is
+    held while the client is slow. The body is gzip-compressed on the fly
+    when the client accepts it. Both tiers are exported and searched, as
+    in get_articles.
+    
+    Args:
+        request: The request (for Accept-Encoding)
+        export_format: format= "ndjson" or "csv" (with a header line; source is the label)
+        days_back: Filter articles from last N days
+        source_id: Filter by specific source
+        search: Full-text search in title, subtitle and content
+        since: Only articles with date_fetched after this time (UTC unless
+            it has an offset); pass the time of the previous export to
+            pull what was added since
+        fields: Comma-separated article fields to export (default: all)
+    
+    Returns:
+        StreamingResponse: The articles as NDJSON or CSV
+    
+    Raises:
+        HTTPException: If the fields are invalid
+    """
+    fields = requested_fields(fields)
+    match = fts_query(search) if search else None
+    cutoff_date = datetime.now().date() - timedelta(days=days_back) if days_back else None
+    if since and since.tzinfo:
+        # Fetch times are stored in UTC (SQLite's CURRENT_TIMESTAMP)
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
     
-    # Get total count
-    total = query.count()
+    def tier_query(db: Session, model, after_id: int):
+        query = filter_tier(select_articles(db, fields, model), model, cutoff_date, source_id)
+        if since:
+            # Compare with the stored text as is, like cursors do
+            query = query.filter(type_coerce(model.date_fetched, String) > since.isoformat(sep=" "))
+        return query.filter(model.id > after_id)
     
-    # Apply pagination and ordering
-    articles = query.order_by(desc(Article.date_published)).offset(
-        (page - 1) * per_page
-    ).limit(per_page).all()
+    def read_batch(db: Session, after_id: int):
+        models = [Article, ColdArticle] if needs_cold_tier(db, cutoff_date) else [Article]
+        tiers = [tier_query(db, model, after_id) for model in models]
+        if match:
+            tiers = [search_tier(tier, model, match) for tier, model in zip(tiers, models)]
+        tiers = [tier.statement for tier in tiers]
+        statement = tiers[0] if len(tiers) == 1 else union_all(*tiers)
+        rows = db.execute(statement.order_by(literal_column("id")).limit(EXPORT_BATCH_SIZE)).all()
+        if export_format == "csv":
+            chunk = article_csv(rows, fields, header=not after_id)
+        else:
+            chunk = article_ndjson(rows, fields)
+        if compressor:
+            chunk = compressor.compress(chunk)
+            if len(rows) < EXPORT_BATCH_SIZE:
+                chunk += compressor.flush()
+        return len(rows), rows[-1].id if rows else after_id, chunk
     
-    return ArticleList(
-        articles=articles,
-        total=total,
-        page=page,
-        per_page=per_page
-    )
+    async def stream():
+        after_id = 0
+        while True:
+            count, after_id, chunk = await run_in_db(read_batch, after_id)
+            if chunk:
+                yield chunk
+            if count < EXPORT_BATCH_SIZE:
+                break
+    
+    headers = {"Content-Disposition": f'attachment; filename="articles.{export_format}"', "Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream(), media_type=EXPORT_MEDIA_TYPES[export_format], headers=headers)
 
 @router.get("/articles/{article_id}", response_model=ArticleSchema)
-async def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(article_id: int):
     """
     Get a specific article by ID.
     
     Args:
         article_id: Article ID
-        db: Database session
     
     Returns:
         Article: Article details
@@ -154,7 +491,14 @@ async def get_article(article_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If article not found
     """
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
+    def read(db: Session):
+        row = select_articles(db, ARTICLE_FIELDS).filter(Article.id == article_id).first()
+        if row is None:
+            # Older articles live in the cold tier
+            row = select_articles(db, ARTICLE_FIELDS, ColdArticle).filter(ColdArticle.id == article_id).first()
+        return row
+    
+    row = await run_in_db(read)
+    if not row:
         raise HTTPException(status_code=404, detail="Article not found")
-    return article 
\ No newline at end of file
+    return json_response(article_adapter, article_rows([row], ARTICLE_FIELDS, with_snippet=False)[0])
@@ -0,0 +1,87 @@
+"""
+Events router for pushing newly scraped articles to clients.
+This router provides a Server-Sent Events stream (see api/events.py).
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from ..database import run_in_db
+from ..events import (EVENT_BATCH_SIZE, KEEPALIVE_INTERVAL, REPLAY_LIMIT, RETRY_MILLISECONDS, articles_event,
+                      broadcaster, read_articles_after, read_last_id, reset_event)
+
+router = APIRouter()
+
+@router.get("/events")
+async def article_events(
+    last_event_id: Optional[int] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Stream newly scraped articles as Server-Sent Events.
+
+    Every "articles" event carries {"articles": [...]} (all fields but
+    content) and has the highest article id in it as its id. Clients that
+    reconnect with Last-Event-ID (EventSource does this by itself) are
+    first sent the articles they missed, or a "reset" event if they
+    missed more than REPLAY_LIMIT. A comment is sent every
+    KEEPALIVE_INTERVAL seconds to keep idle connections open.
+
+    Args:
+        last_event_id: Resume after this event id (for clients that
+            cannot set the Last-Event-ID header)
+        last_event_id_header: The Last-Event-ID header
+
+    Returns:
+        StreamingResponse: The text/event-stream
+    """
+    resume_after = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    async def stream():
+        # Subscribe first, so nothing committed during the replay is missed
+        queue = broadcaster.subscribe()
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+            if resume_after is None:
+                sent_id = await run_in_db(read_last_id)
+            else:
+                missed = await run_in_db(read_articles_after, resume_after, REPLAY_LIMIT + 1)
+                if len(missed) > REPLAY_LIMIT:
+                    sent_id = await run_in_db(read_last_id)
+                    yield reset_event(sent_id)
+                else:
+                    sent_id = resume_after
+                    for start in range(0, len(missed), EVENT_BATCH_SIZE):
+                        batch = missed[start:start + EVENT_BATCH_SIZE]
+                        sent_id = batch[-1].id
+                        yield articles_event(batch)
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if item is None:
+                    return
+                rows, event = item
+                # Skip what the replay already sent
+                if rows[-1].id <= sent_id:
+                    continue
+                if rows[0].id <= sent_id:
+                    # The batch straddles the replay: send only the articles it did not
+                    event = articles_event([row for row in rows if row.id > sent_id])
+                sent_id = rows[-1].id
+                yield event
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # no-transform and X-Accel-Buffering keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
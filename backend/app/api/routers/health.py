@@ -3,16 +3,18 @@ Health check router for API monitoring.
 This router provides endpoints to check if the API is running properly.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from datetime import datetime
-from ..database import get_db
+from ..cache import response_cache
+from ..database import run_in_db
 from ..schemas import HealthCheck
 
 router = APIRouter()
 
 @router.get("/health", response_model=HealthCheck)
-async def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
     Health check endpoint to verify API and database connectivity.
     
@@ -21,8 +23,7 @@ async def health_check(db: Session = Depends(get_db)):
     """
     try:
         # Test database connection
-        from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        await run_in_db(ping_database)
         database_status = "connected"
     except Exception as e:
         database_status = f"error: {str(e)}"
@@ -34,6 +35,20 @@ async def health_check(db: Session = Depends(get_db)):
         database=database_status
     )
 
+def ping_database(db: Session):
+    db.execute(text("SELECT 1"))
+
+@router.get("/health/cache")
+async def cache_stats():
+    """
+    Statistics of the article response cache.
+    
+    Returns:
+        dict: Hits, misses, entries invalidated by new data, evictions,
+            304 responses, the number of entries and the data generation
+    """
+    return response_cache.stats()
+
 @router.get("/health/simple")
 async def simple_health_check():
     """
@@ -1,53 +1,69 @@
 """
 Scheduler router for managing the scraping scheduler.
 This router provides endpoints to control and monitor the scheduler.
+
+Only one API worker runs the scheduler (see scheduler/leader.py). Any
+worker can serve these endpoints: the others report the leader's shared
+state and pass commands on to it.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
-from typing import List
+from typing import Optional
+import os
 import sys
 from pathlib import Path
 
 # Add the parent directory to the path so we can import the scheduler
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from ..database import get_db
 from ..schemas import SchedulerStatus, ScrapingRequest
-from scheduler.scheduler import ScrapingScheduler
+from scheduler.leader import SYNC_INTERVAL, SchedulerLeader
+from scheduler.logs import level_number, read_logs
+from scheduler.scheduler import DB_PATH, LOG_FILE, ScrapingScheduler, log_handler
 
 router = APIRouter()
 
-# Global scheduler instance
-scheduler_instance = None
+# Lock and shared state of the scheduler election, next to the database it scrapes into
+# (the one the API serves: both take DB_PATH from config/database_config.py)
+STATE_DIR = os.environ.get("SCHEDULER_STATE_DIR", str(Path(DB_PATH).parent))
+
+# Takes part in the election from main.py's lifespan; only the leader creates a ScrapingScheduler
+leader = SchedulerLeader(STATE_DIR, ScrapingScheduler)
 
-def get_scheduler():
-    """Get or create the global scheduler instance."""
-    global scheduler_instance
-    if scheduler_instance is None:
-        scheduler_instance = ScrapingScheduler()
-    return scheduler_instance
+async def send_command(action: str, done_message: str, **params) -> dict:
+    """Carry out a scheduler command on the leader (here, or via the shared state)."""
+    await run_in_threadpool(leader.submit, action, **params)
+    if leader.is_leader:
+        return {"message": done_message, "leader_pid": os.getpid()}
+    return {
+        "message": f"Passed to the scheduler leader, which applies it within {SYNC_INTERVAL:g}s",
+        "leader_pid": leader.leader_pid()
+    }
 
 @router.get("/scheduler/status", response_model=SchedulerStatus)
 async def get_scheduler_status():
     """
     Get the current status of the scheduler.
     
+    Served from the job registry's latest snapshot, so it neither
+    schedules nor runs anything. Workers other than the leader serve the
+    snapshot the leader last shared (at most a second or two old).
+    
     Returns:
-        SchedulerStatus: Current scheduler status
+        SchedulerStatus: Current scheduler status, with every job's next
+            run, whether it is running and how its last run went
     """
-    scheduler = get_scheduler()
-    
-    # Get job information
-    scheduler.schedule_jobs()
-    jobs = scheduler.get_job_info()
-    next_run = scheduler.get_next_run()
+    snapshot = leader.snapshot()
     
     return SchedulerStatus(
-        running=scheduler.running,
-        jobs=jobs,
-        next_run=next_run['next_run'] if next_run else None
+        running=snapshot.running,
+        jobs=[job._asdict() for job in snapshot.jobs],
+        next_run=snapshot.next_run,
+        job_running=snapshot.job_running,
+        snapshot_at=snapshot.taken_at,
+        leader_pid=leader.leader_pid()
     )
 
 @router.post("/scheduler/start")
@@ -58,13 +74,10 @@ async def start_scheduler():
     Returns:
         dict: Status message
     """
-    scheduler = get_scheduler()
-    
-    if scheduler.running:
+    if leader.snapshot().running:
         raise HTTPException(status_code=400, detail="Scheduler is already running")
     
-    scheduler.start()
-    return {"message": "Scheduler started successfully"}
+    return await send_command("start", "Scheduler started successfully")
 
 @router.post("/scheduler/stop")
 async def stop_scheduler():
@@ -74,13 +87,10 @@ async def stop_scheduler():
     Returns:
         dict: Status message
     """
-    scheduler = get_scheduler()
-    
-    if not scheduler.running:
+    if not leader.snapshot().running:
         raise HTTPException(status_code=400, detail="Scheduler is not running")
     
-    scheduler.stop()
-    return {"message": "Scheduler stopped successfully"}
+    return await send_command("stop", "Scheduler stopped successfully")
 
 @router.post("/scheduler/restart")
 async def restart_scheduler():
@@ -90,41 +100,26 @@ async def restart_scheduler():
     Returns:
         dict: Status message
     """
-    scheduler = get_scheduler()
-    
-    if scheduler.running:
-        scheduler.stop()
-    
-    scheduler.start()
-    return {"message": "Scheduler restarted successfully"}
+    return await send_command("restart", "Scheduler restarted successfully")
 
 @router.post("/scheduler/run-once")
-async def run_scraping_once(
-    request: ScrapingRequest,
-    background_tasks: BackgroundTasks
-):
+async def run_scraping_once(request: ScrapingRequest):
     """
     Run scraping once manually.
     
+    The leader runs it in a background thread, so the API is not blocked.
+    
     Args:
         request: Scraping request parameters
-        background_tasks: FastAPI background tasks
     
     Returns:
         dict: Status message
     """
-    scheduler = get_scheduler()
-    
-    # Run scraping in background to avoid blocking the API
-    background_tasks.add_task(
-        scheduler.run_scraping_task,
-        days_back=request.days_back
+    response = await send_command(
+        "run_once", f"Scraping task started (days_back: {request.days_back})", days_back=request.days_back
     )
-    
-    return {
-        "message": f"Scraping task started (days_back: {request.days_back})",
-        "task_id": f"scraping_{datetime.utcnow().isoformat()}"
-    }
+    response["task_id"] = f"scraping_{datetime.utcnow().isoformat()}"
+    return response
 
 @router.get("/scheduler/configs")
 async def get_available_configs():
@@ -149,34 +144,47 @@ async def get_available_configs():
 
 @router.get("/scheduler/logs")
 async def get_scheduler_logs(
-    lines: int = 50,
-    level: str = "INFO"
+    lines: int = Query(50, ge=1, le=1000, description="Number of log records to return"),
+    level: Optional[str] = Query("INFO", description="Minimum level, e.g. WARNING also returns errors"),
+    since: Optional[datetime] = Query(None, description="Only records logged at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only records logged at or before this time"),
+    cursor: Optional[int] = Query(None, ge=0, description="Continue before this next_cursor")
 ):
     """
     Get recent scheduler logs.
     
+    Reads scheduler.log backwards from the end and only as far as needed
+    (recent records are served from memory), so the cost does not grow
+    with the size of the log. A record includes its traceback, if any.
+    
     Args:
-        lines: Number of log lines to return
-        level: Log level filter
+        lines: Number of log records to return (max 1000)
+        level: Minimum log level
+        since: Only records logged at or after this time
+        until: Only records logged at or before this time
+        cursor: Continue with the records before this next_cursor
     
     Returns:
-        dict: Recent log entries
+        dict: The matching records (oldest first) and the cursor to the
+            records before them, or None when there are none
     """
+    if level and not level_number(level.upper()):
+        raise HTTPException(status_code=400, detail=f"unknown log level: {level}")
+    # Records are logged in local time
+    since, until = (t.astimezone().replace(tzinfo=None) if t and t.tzinfo else t for t in (since, until))
+    log_file = Path(LOG_FILE)
+    if not log_file.exists():
+        return {"logs": [], "message": "No log file found"}
+    
     try:
-        log_file = Path("scheduler.log")
-        if not log_file.exists():
-            return {"logs": [], "message": "No log file found"}
-        
-        with open(log_file, 'r') as f:
-            log_lines = f.readlines()
-        
-        # Get last N lines
-        recent_logs = log_lines[-lines:] if len(log_lines) > lines else log_lines
-        
-        return {
-            "logs": recent_logs,
-            "total_lines": len(log_lines),
-            "returned_lines": len(recent_logs)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error reading logs: {str(e)}") 
\ No newline at end of file
+        entries, next_cursor = await run_in_threadpool(
+            read_logs, log_file, lines, level, since, until, cursor, log_handler
+        )
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Error reading logs: {str(e)}")
+    
+    return {
+        "logs": [entry.text for entry in entries],
+        "returned_lines": len(entries),
+        "next_cursor": next_cursor,
+    }
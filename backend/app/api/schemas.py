@@ -42,6 +42,7 @@ class Article(ArticleBase):
     date_fetched: datetime
     content: Optional[str] = None
     source: Optional[Source] = None
+    snippet: Optional[str] = None  # Highlighted search match, only set when searching
     
     class Config:
         from_orm = True
@@ -59,9 +60,10 @@ class ArticleCreate(ArticleBase):
 class ArticleList(BaseModel):
     """Schema for list of articles"""
     articles: List[Article]
-    total: int
+    total: Optional[int] = None  # Left out when paginating by cursor unless requested
     page: int
     per_page: int
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
 
 class SourceList(BaseModel):
     """Schema for list of sources"""
@@ -82,6 +84,9 @@ class SchedulerStatus(BaseModel):
     running: bool
     jobs: List[dict]
     next_run: Optional[datetime] = None
+    job_running: bool = False
+    snapshot_at: Optional[datetime] = None
+    leader_pid: Optional[int] = None
 
 class ScrapingRequest(BaseModel):
     """Schema for manual scraping request"""
@@ -0,0 +1,169 @@
+"""
+Column projections and batch JSON serialization for article lists.
+
+List endpoints select only the columns a response needs (with the source
+joined in the same query) and turn the rows straight into JSON bytes with
+one pydantic TypeAdapter call for the whole response, instead of building
+an ORM object and a pydantic model per article. The JSON has the same
+shape as schemas.Article / schemas.ArticleList. Exports are encoded the
+same way, one batch of rows at a time, as NDJSON or CSV.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from .models import Article, Source
+
+# Fields a client can ask for with fields=; "source" is the joined source summary
+ARTICLE_FIELDS = (
+    "id", "source_id", "article_url", "title", "subtitle",
+    "date_published", "date_fetched", "content", "source",
+)
+SOURCE_COLUMNS = {
+    "source_label": Source.label,
+    "source_url": Source.url,
+    "source_type": Source.type,
+}
+
+class SourceSummary(TypedDict):
+    id: int
+    label: str
+    url: str
+    type: str
+
+class ArticleRow(TypedDict, total=False):
+    id: int
+    source_id: int
+    article_url: str
+    title: str
+    subtitle: Optional[str]
+    date_published: Optional[date]
+    date_fetched: Optional[datetime]
+    content: Optional[str]
+    source: Optional[SourceSummary]
+    snippet: Optional[str]
+
+class ArticleListBody(TypedDict):
+    articles: List[ArticleRow]
+    total: Optional[int]
+    page: int
+    per_page: int
+    next_cursor: Optional[str]
+
+article_adapter = TypeAdapter(ArticleRow)
+article_rows_adapter = TypeAdapter(List[ArticleRow])
+article_list_adapter = TypeAdapter(ArticleListBody)
+
+def parse_fields(fields: Optional[str]) -> tuple:
+    """
+    Parse a comma-separated fields= value.
+
+    Returns:
+        tuple: The requested fields in ARTICLE_FIELDS order (all if empty)
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    if not fields:
+        return ARTICLE_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(ARTICLE_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"unknown fields: {', '.join(sorted(unknown))} (allowed: {', '.join(ARTICLE_FIELDS)})"
+        )
+    return tuple(field for field in ARTICLE_FIELDS if field in requested)
+
+def article_columns(fields: tuple, model=Article) -> list:
+    """
+    Columns to select for the given fields.
+
+    id and date_published are always selected, since cursors are built
+    from them; the source columns only when "source" is requested (the
+    caller outer-joins Source, so they are NULL for an unknown source). ``model`` is Article or ColdArticle; both give
+    the same column names.
+    """
+    columns = [model.id.label("id"), model.date_published.label("date_published")]
+    for field in fields:
+        if field == "source":
+            columns += [column.label(label) for label, column in SOURCE_COLUMNS.items()]
+            if "source_id" not in fields:
+                columns.append(model.source_id.label("source_id"))
+        elif field not in ("id", "date_published"):
+            columns.append(getattr(model, field).label(field))
+    return columns
+
+def article_rows(rows: list, fields: tuple, with_snippet: bool = True) -> List[dict]:
+    """
+    Build the response dicts for selected rows.
+
+    Column positions are looked up once per batch, so each row is read by
+    index rather than by attribute name. A "snippet" column (selected by
+    searches) is passed through. Without one, snippet is only set, to None,
+    in the full payload (all fields, as schemas.Article) and if
+    ``with_snippet``; a fields= projection leaves it out.
+    """
+    if not rows:
+        return []
+    index = {name: position for position, name in enumerate(rows[0]._fields)}
+    plain = [(field, index[field]) for field in fields if field not in ("source", "date_published")]
+    published = index["date_published"] if "date_published" in fields else None
+    source = (
+        [index[name] for name in ("source_id", "source_label", "source_url", "source_type")]
+        if "source" in fields else None
+    )
+    snippet = index.get("snippet")
+    with_snippet = snippet is not None or (with_snippet and fields == ARTICLE_FIELDS)
+
+    result = []
+    for row in rows:
+        data = {field: row[position] for field, position in plain}
+        if published is not None:
+            value = row[published]
+            # Published dates are exposed as dates, as in schemas.Article
+            data["date_published"] = value.date() if isinstance(value, datetime) else value
+        if source is not None:
+            # label is NOT NULL, so NULL means no sources row matched
+            data["source"] = {
+                "id": row[source[0]],
+                "label": row[source[1]],
+                "url": row[source[2]],
+                "type": row[source[3]],
+            } if row[source[1]] is not None else None
+        if with_snippet:
+            data["snippet"] = row[snippet] if snippet is not None else None
+        result.append(data)
+    return result
+
+def json_response(adapter: TypeAdapter, body) -> Response:
+    """Serialize a response body to JSON bytes in one call."""
+    return Response(content=adapter.dump_json(body), media_type="application/json")
+
+def article_ndjson(rows: list, fields: tuple) -> bytes:
+    """Encode rows as newline-delimited JSON, one article object per line."""
+    return b"".join(
+        article_adapter.dump_json(data) + b"\n" for data in article_rows(rows, fields, with_snippet=False)
+    )
+
+def article_csv(rows: list, fields: tuple, header: bool = False) -> bytes:
+    """
+    Encode rows as CSV lines, optionally preceded by the header line.
+
+    CSV is flat, so the "source" field holds the source label; empty
+    values (and unknown sources) are written as empty cells.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    for data in article_rows(rows, fields, with_snippet=False):
+        if data.get("source"):
+            data["source"] = data["source"]["label"]
+        writer.writerow("" if data[field] is None else data[field] for field in fields)
+    return buffer.getvalue().encode("utf-8")
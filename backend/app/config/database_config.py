@@ -0,0 +1,10 @@
+"""
+Database location shared by the API, the scraper and the scheduler.
+"""
+import os
+from pathlib import Path
+
+# scraper.db in app/data, unless SCRAPER_DB_PATH points elsewhere. The API
+# reads and the scheduler (in whichever API worker leads) scrapes into the
+# same file, so both must take it from here.
+DB_PATH = os.environ.get("SCRAPER_DB_PATH", str(Path(__file__).parent.parent / "data" / "scraper.db"))
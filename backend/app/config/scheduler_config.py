@@ -10,6 +10,24 @@ SCHEDULER_CONFIG = {
     "run_on_startup": True,
     "startup_days_back": 3,
     
+    # Maximum number of sources fetched concurrently per run
+    "workers": 8,
+    
+    # Scheduled runs only scan each source down to its last seen article;
+    # days_back then only backfills sources that have not been scraped yet
+    "incremental": True,
+    
+    # Fetch full article content for new articles after each run (off by
+    # default: up to 200 extra page fetches per run)
+    "fetch_content": False,
+    
+    # Move articles published more than hot_days ago to the compressed
+    # cold tier after each run (see data/tiering.py); opt in by enabling it
+    "tiering": {
+        "enabled": False,
+        "hot_days": 365
+    },
+    
     # Daily scraping configuration
     "daily_scraping": {
         "enabled": True,
@@ -52,8 +70,18 @@ SCHEDULER_CONFIG = {
     # Error handling
     "error_handling": {
         "max_retries": 3,
-        "retry_delay": 300,  # 5 minutes
+        "retry_delay": 300,  # 5 minutes (upper bound for a single retry backoff)
         "continue_on_error": True
+    },
+    
+    # Shared HTTP client (connection pooling and retry backoff)
+    "http": {
+        "timeout": 10,
+        "pool_maxsize": 8,      # Keep-alive connections per host
+        "host_pool_sizes": {    # Per-host overrides
+            "www.gov.uk": 8
+        },
+        "retry_backoff": 2      # Base backoff in seconds, doubled per attempt, jittered
     }
 }
 
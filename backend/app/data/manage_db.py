@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Database management script: show the schema version, apply migrations and
+rebuild the derived data (full-text search index, statistics rollup) and
+move old articles to the cold tier.
+"""
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+try:
+    from .migrations import (LATEST_VERSION, migrate, pending_migrations, rebuild_article_counts,
+                             rebuild_search_index, schema_version)
+    from .tiering import DEFAULT_HOT_DAYS, move_to_cold, tier_sizes
+except ImportError:
+    # Fallback for when running as a script
+    from migrations import (LATEST_VERSION, migrate, pending_migrations, rebuild_article_counts,
+                            rebuild_search_index, schema_version)
+    from tiering import DEFAULT_HOT_DAYS, move_to_cold, tier_sizes
+
+# The database the API and the scheduler use (see config/database_config.py)
+sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from app.config.database_config import DB_PATH
+except ImportError:
+    from config.database_config import DB_PATH
+
+def show_status(db_path):
+    """Print the schema version, pending migrations and indexes of a database"""
+    conn = sqlite3.connect(db_path)
+    try:
+        print(f"🗃️  Database: {db_path}")
+        print(f"   Schema version: {schema_version(conn)} (latest: {LATEST_VERSION})")
+        print(f"   Journal mode: {conn.execute('PRAGMA journal_mode').fetchone()[0]}")
+        hot, cold = tier_sizes(db_path)
+        print(f"   Articles: {hot} hot, {cold} cold")
+        pending = pending_migrations(conn)
+        if pending:
+            print("   Pending migrations:")
+            for version, description, _ in pending:
+                print(f"     {version}: {description}")
+        else:
+            print("   No pending migrations")
+
+        print("   Indexes:")
+        for name, table in conn.execute("""
+            SELECT name, tbl_name FROM sqlite_master
+            WHERE type = 'index' AND name NOT LIKE 'sqlite_%'
+            ORDER BY tbl_name, name
+        """):
+            print(f"     {table}.{name}")
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the scraper database schema')
+    parser.add_argument('action', choices=['status', 'migrate', 'rebuild-search', 'rebuild-stats', 'tier'],
+                       help='Action to perform')
+    parser.add_argument('--db', type=str, default=DB_PATH,
+                       help='Path to the database (default: data/scraper.db)')
+    parser.add_argument('--target', type=int, default=None,
+                       help='Migrate up to this schema version (default: latest)')
+    parser.add_argument('--hot-days', type=int, default=DEFAULT_HOT_DAYS,
+                       help=f'Keep articles published within this many days hot (default: {DEFAULT_HOT_DAYS})')
+
+    args = parser.parse_args()
+
+    if args.action == 'status':
+        show_status(args.db)
+    elif args.action == 'migrate':
+        before, after = migrate(args.db, target=args.target, verbose=True)
+        if before == after:
+            print(f"✅ Already at schema version {after}")
+        else:
+            print(f"✅ Migrated {args.db} from schema version {before} to {after}")
+    elif args.action == 'rebuild-search':
+        migrate(args.db, verbose=True)
+        indexed = rebuild_search_index(args.db)
+        print(f"🔎 Rebuilt search index over {indexed} articles")
+    elif args.action == 'rebuild-stats':
+        migrate(args.db, verbose=True)
+        rows = rebuild_article_counts(args.db)
+        print(f"📊 Rebuilt statistics rollup ({rows} day/source rows)")
+    elif args.action == 'tier':
+        migrate(args.db, verbose=True)
+        moved = move_to_cold(args.db, hot_days=args.hot_days)
+        hot, cold = tier_sizes(args.db)
+        print(f"🧊 Moved {moved} articles to the cold tier ({hot} hot, {cold} cold)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for scraper.db.
+
+This is the single definition of the database schema. The schema version
+is kept in SQLite's ``PRAGMA user_version``; ``migrate()`` applies every
+migration above it in one transaction, so running it on every startup
+(scraper, scheduler, API, seed scripts) is cheap and safe, also when two
+processes start at once.
+
+To change the schema, append a new (version, description, function)
+entry to MIGRATIONS; never edit a migration that has been released.
+"""
+
+try:
+    from .tiering import attach_cold, index_cold_articles
+    from .writer import bump_generation, connect
+except ImportError:
+    # Fallback for when running as a script
+    from tiering import attach_cold, index_cold_articles
+    from writer import bump_generation, connect
+
+def create_base_schema(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sources (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      label TEXT NOT NULL,
+      url TEXT NOT NULL UNIQUE,
+      type TEXT NOT NULL,
+      selector TEXT,
+      link_selector TEXT,
+      title_selector TEXT,
+      subtitle_selector TEXT,
+      date_selector TEXT,
+      last_scraped TIMESTAMP
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS articles (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      source_id INTEGER NOT NULL REFERENCES sources(id),
+      article_url TEXT NOT NULL UNIQUE,
+      title TEXT NOT NULL,
+      subtitle TEXT,
+      date_published DATE,
+      date_fetched TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+      content TEXT
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS summary_pages (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      label TEXT NOT NULL,
+      url TEXT NOT NULL UNIQUE,
+      selector TEXT,
+      last_fetched TIMESTAMP
+    );
+    """)
+
+def add_source_fetch_state(cursor):
+    # Databases initialized by older scraper versions may already have some of these
+    cursor.execute("PRAGMA table_info(sources)")
+    source_columns = {row[1] for row in cursor.fetchall()}
+    for column, column_type in (('etag', 'TEXT'), ('last_modified', 'TEXT'), ('content_hash', 'TEXT'),
+                                ('hwm_date_published', 'TIMESTAMP'), ('hwm_article_url', 'TEXT')):
+        if column not in source_columns:
+            cursor.execute(f"ALTER TABLE sources ADD COLUMN {column} {column_type}")
+
+def add_article_indexes(cursor):
+    # GET /articles?source_id=...: filter by source, newest first
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_source_published
+    ON articles (source_id, date_published DESC)
+    """)
+    # GET /articles (optionally days_back), /articles/today, /articles/stats
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_published
+    ON articles (date_published DESC)
+    """)
+    # GET /articles/recent
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_fetched
+    ON articles (date_fetched DESC)
+    """)
+    # content.py: articles still waiting for their content, by id
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_missing_content
+    ON articles (id) WHERE content IS NULL
+    """)
+    # Give the planner statistics to choose between the indexes
+    cursor.execute("ANALYZE")
+
+def add_article_search(cursor):
+    # External-content FTS5 index over the articles table, kept in sync by triggers
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+      title, subtitle, content,
+      content='articles', content_rowid='id',
+      tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+      INSERT INTO articles_fts (rowid, title, subtitle, content)
+      VALUES (new.id, new.title, new.subtitle, new.content);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+      INSERT INTO articles_fts (articles_fts, rowid, title, subtitle, content)
+      VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, subtitle, content ON articles BEGIN
+      INSERT INTO articles_fts (articles_fts, rowid, title, subtitle, content)
+      VALUES ('delete', old.id, old.title, old.subtitle, old.content);
+      INSERT INTO articles_fts (rowid, title, subtitle, content)
+      VALUES (new.id, new.title, new.subtitle, new.content);
+    END
+    """)
+    # Index the articles stored so far
+    cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+# Rows of article_counts rebuilt from scratch, for the articles in {articles}
+ARTICLE_COUNTS_SELECT = """
+    SELECT day, source_id, SUM(published), SUM(fetched) FROM (
+      SELECT date(date_published) AS day, source_id, 1 AS published, 0 AS fetched
+      FROM {articles} WHERE date_published IS NOT NULL
+      UNION ALL
+      SELECT date(date_fetched), source_id, 0, 1
+      FROM {articles} WHERE date_fetched IS NOT NULL
+    )
+    WHERE true
+    GROUP BY day, source_id
+"""
+# Articles only in the cold tier (see tiering.py)
+COLD_ONLY_ARTICLES = """
+    (SELECT * FROM cold.articles c WHERE NOT EXISTS (SELECT 1 FROM main.articles h WHERE h.id = c.id))
+"""
+
+def add_article_counts(cursor):
+    # Articles published and fetched per day and source, kept up to date by
+    # triggers in the same transaction as every insert, update and delete
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS article_counts (
+      day DATE NOT NULL,
+      source_id INTEGER NOT NULL,
+      published INTEGER NOT NULL DEFAULT 0,
+      fetched INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY (day, source_id)
+    ) WITHOUT ROWID
+    """)
+    for event, sign, row in (('INSERT', '+', 'new'), ('DELETE', '-', 'old')):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS article_counts_{event.lower()} AFTER {event} ON articles BEGIN
+          {count_statements(sign, row)}
+        END
+        """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS article_counts_update
+    AFTER UPDATE OF source_id, date_published, date_fetched ON articles BEGIN
+      {count_statements('-', 'old')}
+      {count_statements('+', 'new')}
+    END
+    """)
+    cursor.execute(
+        "INSERT INTO article_counts (day, source_id, published, fetched) "
+        + ARTICLE_COUNTS_SELECT.format(articles="articles")
+    )
+
+def count_statements(sign, row):
+    """Trigger statements adding (+) or removing (-) one article row in article_counts"""
+    return " ".join(f"""
+      INSERT INTO article_counts (day, source_id, {column})
+      SELECT date({row}.{date_column}), {row}.source_id, {sign}1 WHERE {row}.{date_column} IS NOT NULL
+      ON CONFLICT (day, source_id) DO UPDATE SET {column} = {column} {sign} 1;
+    """ for column, date_column in (('published', 'date_published'), ('fetched', 'date_fetched')))
+
+def add_data_generation(cursor):
+    # One row, bumped by every write that changes what the API serves (see writer.DATA_CHANGES)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS data_generation (
+      id INTEGER PRIMARY KEY CHECK (id = 1),
+      generation INTEGER NOT NULL
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_generation (id, generation) VALUES (1, 0)")
+
+# (version, description, function); versions are consecutive
+MIGRATIONS = [
+    (1, "sources, articles and summary_pages tables", create_base_schema),
+    (2, "HTTP cache validators and high-watermarks on sources", add_source_fetch_state),
+    (3, "indexes on articles for the API query shapes", add_article_indexes),
+    (4, "full-text search index over article title, subtitle and content", add_article_search),
+    (5, "per-day, per-source article counts for statistics", add_article_counts),
+    (6, "data generation counter for API response caching", add_data_generation),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def rebuild_search_index(db_path):
+    """Rebuild the full-text search indexes of both tiers from their articles and optimize them"""
+    conn = connect(db_path)
+    try:
+        attach_cold(conn, db_path)
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+        index_cold_articles(conn.cursor())
+        conn.execute("INSERT INTO cold.articles_fts (articles_fts) VALUES ('optimize')")
+        bump_generation(conn.cursor())
+        conn.commit()
+        return conn.execute(
+            "SELECT (SELECT COUNT(*) FROM articles) + (SELECT COUNT(*) FROM cold.articles)"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+def rebuild_article_counts(db_path):
+    """Recompute the article_counts rollup from the articles in the hot and cold tier"""
+    conn = connect(db_path)
+    try:
+        attach_cold(conn, db_path)
+        conn.execute("DELETE FROM article_counts")
+        for articles in ("articles", COLD_ONLY_ARTICLES):
+            conn.execute(f"""
+                INSERT INTO article_counts (day, source_id, published, fetched)
+                {ARTICLE_COUNTS_SELECT.format(articles=articles)}
+                ON CONFLICT (day, source_id) DO UPDATE SET
+                  published = published + excluded.published,
+                  fetched = fetched + excluded.fetched
+            """)
+        bump_generation(conn.cursor())
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM article_counts").fetchone()[0]
+    finally:
+        conn.close()
+
+def schema_version(conn):
+    """Get the schema version recorded in a database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def pending_migrations(conn, target=None):
+    """List the (version, description, function) migrations not yet applied"""
+    target = LATEST_VERSION if target is None else target
+    current = schema_version(conn)
+    return [migration for migration in MIGRATIONS if current < migration[0] <= target]
+
+def migrate(db_path, target=None, verbose=False):
+    """Bring a database up to ``target`` (default: latest) schema version.
+
+    Returns a tuple of (version before, version after). Raises RuntimeError
+    if the database was migrated by a newer version of the app.
+    """
+    conn = connect(db_path, isolation_level=None)
+    try:
+        # Fast path: nothing to do, no write lock taken
+        current = schema_version(conn)
+        if current > LATEST_VERSION:
+            raise RuntimeError(
+                f"Database schema version {current} is newer than this app supports ({LATEST_VERSION})"
+            )
+        if not pending_migrations(conn, target):
+            return current, current
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock in case another process migrated meanwhile
+            current = schema_version(conn)
+            version = current
+            for version, description, apply in pending_migrations(conn, target):
+                if verbose:
+                    print(f"🛠️  Applying migration {version}: {description}")
+                apply(cursor)
+            bump_generation(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return current, version
+    finally:
+        conn.close()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Hot/cold tiering of articles.
+
+The articles table in scraper.db is the hot tier: the recent articles
+nearly every API request reads. Articles published more than ``hot_days``
+ago are moved to the cold tier, an articles table of the same shape in a
+separate database next to it (scraper_cold.db), with their content stored
+zlib-compressed. Connections attach the cold database as ``cold``; article
+ids are kept, so an article keeps its id (and API URL) when it moves.
+
+Rows are copied to the cold tier in one transaction and deleted from the
+hot tier in a second one (which copies them again, in case they changed
+meanwhile). An interrupted move can leave an article in both tiers, where
+readers prefer the hot copy, but never in neither; the next move finishes
+it. Deleting a hot row fires the articles triggers: the full-text
+index drops it, and the per-day article_counts rollup is compensated in
+the same transaction, so statistics still count every article.
+
+The cold tier has a full-text index of its own, cold.articles_fts. It is
+contentless (it keeps no copy of the text, which is only stored
+compressed) and is updated by the same statements that copy articles in,
+since triggers cannot span databases. Search reads both indexes.
+"""
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    from .writer import connect, get_writer
+except ImportError:
+    # Fallback for when running as a script
+    from writer import connect, get_writer
+
+DEFAULT_HOT_DAYS = 365
+MOVE_BATCH_SIZE = 1000
+COMPRESSION_LEVEL = 6
+
+def cold_path(db_path):
+    """Path of the cold tier database belonging to ``db_path``"""
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}_cold{path.suffix or '.db'}"))
+
+def deflate(text):
+    return None if text is None else zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+
+def inflate(blob):
+    return None if blob is None else zlib.decompress(blob).decode('utf-8')
+
+def create_cold_schema(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS articles (
+      id INTEGER PRIMARY KEY,
+      source_id INTEGER NOT NULL,
+      article_url TEXT NOT NULL UNIQUE,
+      title TEXT NOT NULL,
+      subtitle TEXT,
+      date_published DATE,
+      date_fetched TIMESTAMP,
+      content BLOB
+    )
+    """)
+    # Same list orders as the hot tier (see migrations.add_article_indexes)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_source_published
+    ON articles (source_id, date_published DESC)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_articles_published
+    ON articles (date_published DESC)
+    """)
+    # Same tokenizer as the hot tier's index (see migrations.add_article_search)
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+      title, subtitle, content,
+      content='',
+      tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """)
+
+def index_cold_articles(cursor, schema="cold"):
+    """Rebuild the cold tier's full-text index from its articles (inflate() must be registered)"""
+    cursor.execute(f"INSERT INTO {schema}.articles_fts (articles_fts) VALUES ('delete-all')")
+    cursor.execute(f"""
+        INSERT INTO {schema}.articles_fts (rowid, title, subtitle, content)
+        SELECT id, title, subtitle, inflate(content) FROM {schema}.articles
+    """)
+
+def has_search_index(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone() is not None
+
+def attach_cold(conn, db_path):
+    """Attach the cold tier of ``db_path`` to a connection as ``cold``.
+
+    Creates the cold database on first use and registers the
+    deflate()/inflate() SQL functions for its content column.
+    """
+    path = cold_path(db_path)
+    cold = connect(path, isolation_level=None)
+    try:
+        if not has_search_index(cold):
+            # First use, or a cold tier from before it had a search index: create and fill it
+            cold.create_function("inflate", 1, inflate, deterministic=True)
+            cold.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have done it while we waited for the lock
+                if not has_search_index(cold):
+                    create_cold_schema(cold.cursor())
+                    index_cold_articles(cold.cursor(), "main")
+                cold.execute("COMMIT")
+            except BaseException:
+                cold.execute("ROLLBACK")
+                raise
+    finally:
+        cold.close()
+    conn.create_function("deflate", 1, deflate, deterministic=True)
+    conn.create_function("inflate", 1, inflate, deterministic=True)
+    conn.execute("ATTACH DATABASE ? AS cold", (path,))
+
+# article_counts rows of the articles in temp.tier_batch, added back before they are deleted
+COMPENSATE_COUNTS = """
+    INSERT INTO article_counts (day, source_id, published, fetched)
+    SELECT day, source_id, SUM(published), SUM(fetched) FROM (
+      SELECT date(date_published) AS day, source_id, 1 AS published, 0 AS fetched
+      FROM articles WHERE id IN (SELECT id FROM temp.tier_batch) AND date_published IS NOT NULL
+      UNION ALL
+      SELECT date(date_fetched), source_id, 0, 1
+      FROM articles WHERE id IN (SELECT id FROM temp.tier_batch) AND date_fetched IS NOT NULL
+    )
+    WHERE true
+    GROUP BY day, source_id
+    ON CONFLICT (day, source_id) DO UPDATE SET
+      published = published + excluded.published,
+      fetched = fetched + excluded.fetched
+"""
+
+# Copy the articles in temp.tier_batch to the cold tier, compressing their content and
+# replacing their entries in its search index (a contentless index is given the old text
+# to remove, which is what it was indexed with)
+COPY_BATCH = (
+    """
+    INSERT INTO cold.articles_fts (articles_fts, rowid, title, subtitle, content)
+    SELECT 'delete', id, title, subtitle, inflate(content)
+    FROM cold.articles WHERE id IN (SELECT id FROM temp.tier_batch)
+    """,
+    """
+    INSERT OR REPLACE INTO cold.articles
+    (id, source_id, article_url, title, subtitle, date_published, date_fetched, content)
+    SELECT id, source_id, article_url, title, subtitle, date_published, date_fetched, deflate(content)
+    FROM articles WHERE id IN (SELECT id FROM temp.tier_batch)
+    """,
+    """
+    INSERT INTO cold.articles_fts (rowid, title, subtitle, content)
+    SELECT id, title, subtitle, content FROM articles WHERE id IN (SELECT id FROM temp.tier_batch)
+    """,
+)
+
+def copy_batch(cursor):
+    for statement in COPY_BATCH:
+        cursor.execute(statement)
+
+def move_to_cold(db_path, hot_days=DEFAULT_HOT_DAYS, batch_size=MOVE_BATCH_SIZE):
+    """Move articles published more than ``hot_days`` days ago to the cold tier.
+
+    Works in batches of ``batch_size`` articles, so the write lock is only
+    held briefly. Returns the number of articles moved.
+    """
+    if hot_days < 1:
+        raise ValueError("hot_days must be at least 1")
+    cutoff = str(date.today() - timedelta(days=hot_days))
+    writer = get_writer(db_path)
+    moved = 0
+    while True:
+        with writer.transaction() as cursor:
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS tier_batch (id INTEGER PRIMARY KEY)")
+            cursor.execute("DELETE FROM temp.tier_batch")
+            cursor.execute("""
+                INSERT INTO temp.tier_batch (id)
+                SELECT id FROM articles WHERE date_published < ? ORDER BY date_published LIMIT ?
+            """, (cutoff, batch_size))
+            if not cursor.rowcount:
+                break
+            copy_batch(cursor)
+        with writer.transaction() as cursor:
+            copy_batch(cursor)
+            cursor.execute(COMPENSATE_COUNTS)
+            cursor.execute("DELETE FROM articles WHERE id IN (SELECT id FROM temp.tier_batch)")
+            moved += cursor.rowcount
+
+    if moved:
+        # Let the planner merge both tiers in index order (see routers/articles.py)
+        with writer.transaction() as cursor:
+            cursor.execute("ANALYZE cold")
+    return moved
+
+def tier_sizes(db_path):
+    """Number of articles in the hot and the cold tier"""
+    conn = connect(db_path)
+    try:
+        attach_cold(conn, db_path)
+        hot = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        cold = conn.execute("""
+            SELECT COUNT(*) FROM cold.articles c
+            WHERE NOT EXISTS (SELECT 1 FROM articles h WHERE h.id = c.id)
+        """).fetchone()[0]
+        return hot, cold
+    finally:
+        conn.close()
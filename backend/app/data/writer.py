@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Connections and the single write path for scraper.db.
+
+The scraper, the content stage, the seed scripts and the scheduler write
+to scraper.db while the API reads it. To keep readers and writers out of
+each other's way:
+
+- The database runs in WAL journal mode, so readers never block the
+  writer and the writer never blocks readers.
+- Every connection waits up to BUSY_TIMEOUT seconds for a lock instead
+  of failing with "database is locked" straight away.
+- All writes in a process go through one ``DatabaseWriter`` per database
+  file. Its transactions are short (e.g. one per scraped source), start
+  with BEGIN IMMEDIATE so a write lock is taken up front rather than
+  upgraded halfway, and are serialized by an in-process lock, so writers
+  queue instead of contending for SQLite's lock. The time spent queued
+  in the process and the time spent waiting for SQLite's write lock
+  (held by another process) are recorded separately.
+- Every transaction that changes what the API serves (articles, their
+  counts, or the label, url or type of a source) bumps the generation
+  counter in the data_generation table, which tells the API's response
+  cache that what it has cached is out of date (see api/cache.py).
+  Source bookkeeping (last_scraped, validators, high-watermarks) does
+  not, so a scrape that finds nothing new leaves the caches warm.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+BUSY_TIMEOUT = 30  # Seconds a connection waits for a lock before failing
+
+# (table, trigger event) of the writes that change what the API serves; a
+# temporary trigger per entry marks the writer's transaction as changing data
+DATA_CHANGES = (
+    ('articles', 'INSERT'), ('articles', 'UPDATE'), ('articles', 'DELETE'),
+    ('article_counts', 'INSERT'), ('article_counts', 'UPDATE'), ('article_counts', 'DELETE'),
+    ('sources', 'INSERT'), ('sources', 'UPDATE OF label, url, type'), ('sources', 'DELETE'),
+)
+
+def configure_connection(conn, busy_timeout=BUSY_TIMEOUT):
+    """Apply the lock and journal settings every scraper.db connection uses"""
+    conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+    # WAL is persistent in the database file; after the first connection this is a no-op
+    conn.execute("PRAGMA journal_mode = WAL")
+    # Safe with WAL: a power loss can only roll back the last commits, never corrupt
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+def bump_generation(cursor):
+    """Record in the current transaction that the data changed"""
+    try:
+        cursor.execute("UPDATE data_generation SET generation = generation + 1")
+    except sqlite3.OperationalError as e:
+        # Databases not yet migrated to schema version 6 have no counter
+        if "no such table" not in str(e):
+            raise
+
+def connect(db_path, busy_timeout=BUSY_TIMEOUT, **kwargs):
+    """Open a connection to the database with the shared settings applied"""
+    conn = sqlite3.connect(db_path, timeout=busy_timeout, **kwargs)
+    configure_connection(conn, busy_timeout)
+    return conn
+
+class DatabaseWriter:
+    """The one connection a process writes to a database file through.
+
+    Use ``transaction()`` for every write; it may be called from any
+    thread. Reads that do not need to see uncommitted writes should use
+    their own ``connect()`` connection.
+    """
+
+    def __init__(self, db_path, busy_timeout=BUSY_TIMEOUT):
+        try:
+            from .tiering import attach_cold
+        except ImportError:
+            from tiering import attach_cold
+
+        self.db_path = db_path
+        self._conn = connect(db_path, busy_timeout, isolation_level=None, check_same_thread=False)
+        # Writes check and move articles across both tiers (see tiering.py)
+        attach_cold(self._conn, db_path)
+        self._watched = set()  # Tables whose data changes are marked (see _watch_changes)
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'transactions': 0, 'rollbacks': 0,
+                       'queue_waits': 0, 'queue_wait_seconds': 0.0, 'max_queue_wait_seconds': 0.0,
+                       'lock_waits': 0, 'lock_wait_seconds': 0.0, 'max_lock_wait_seconds': 0.0}
+
+    @contextmanager
+    def transaction(self):
+        """Run a write transaction, yielding a cursor.
+
+        Commits when the block exits and rolls back if it raises. Nested
+        calls on the same thread join the outer transaction.
+        """
+        requested = time.perf_counter()
+        with self._lock:
+            queued = time.perf_counter() - requested
+            cursor = self._conn.cursor()
+            if self._conn.in_transaction:
+                yield cursor
+                return
+
+            self._watch_changes(cursor)
+            start = time.perf_counter()
+            cursor.execute("BEGIN IMMEDIATE")
+            self._record_wait(queued, time.perf_counter() - start)
+            try:
+                yield cursor
+                cursor.execute("SELECT 1 FROM temp.data_changed")
+                if cursor.fetchone():
+                    bump_generation(cursor)
+                    cursor.execute("DELETE FROM temp.data_changed")
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                with self._stats_lock:
+                    self._stats['rollbacks'] += 1
+                raise
+
+    def _watch_changes(self, cursor):
+        """Install the temporary triggers of DATA_CHANGES on the tables that exist by now.
+
+        Runs outside a transaction, so a rollback cannot undo them; tables
+        created later (by a migration) are picked up by a later call.
+        """
+        if len(self._watched) == len({table for table, _ in DATA_CHANGES}):
+            return
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS data_changed (changed INTEGER)")
+        cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cursor.fetchall()}
+        for number, (table, trigger_event) in enumerate(DATA_CHANGES):
+            if table in tables and table not in self._watched:
+                cursor.execute(f"""
+                    CREATE TEMP TRIGGER IF NOT EXISTS data_changed_{number} AFTER {trigger_event} ON main.{table}
+                    BEGIN INSERT INTO data_changed SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM data_changed); END
+                """)
+        self._watched |= {table for table, _ in DATA_CHANGES} & tables
+
+    def _record_wait(self, queued, waited):
+        """Record the time a transaction was queued in this process and waited for SQLite's lock"""
+        with self._stats_lock:
+            self._stats['transactions'] += 1
+            # Anything above a millisecond was spent behind another writer
+            for name, seconds in (('queue', queued), ('lock', waited)):
+                if seconds > 0.001:
+                    self._stats[f'{name}_waits'] += 1
+                self._stats[f'{name}_wait_seconds'] += seconds
+                self._stats[f'max_{name}_wait_seconds'] = max(self._stats[f'max_{name}_wait_seconds'], seconds)
+
+    def stats(self):
+        """Counts of transactions and rollbacks, the time queued in this process and
+        the time spent waiting for SQLite's write lock"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+def get_writer(db_path):
+    """Get the process-wide writer for a database file"""
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = _writers[db_path] = DatabaseWriter(db_path)
+        return writer
+
+def close_writers():
+    """Close every writer (e.g. before the database file is replaced)"""
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.close()
+        _writers.clear()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+One scheduler across all API worker processes.
+
+With several workers every process imports the scheduler router, but only
+one of them may scrape. ``SchedulerLeader`` elects it with an exclusive
+``flock`` on scheduler.lock: the worker holding the lock is the leader and
+owns the ScrapingScheduler. The kernel releases the lock when a process
+exits, however it dies, and the other workers try to take it every
+RETRY_INTERVAL seconds, so a new leader takes over within seconds.
+
+The workers share the leader's state through files in the state directory
+(next to scraper.db unless SCHEDULER_STATE_DIR is set):
+
+- scheduler_state.json is written by the leader only: its pid, the
+  latest registry snapshot and whether the scheduler should be running.
+  Every worker answers /scheduler/status from it, and a new leader
+  starts the scheduler if its predecessor had it running.
+- scheduler_commands/ holds the start, stop, restart and run-once
+  requests received by the other workers, one file each; the leader
+  carries them out in order within SYNC_INTERVAL seconds.
+
+Without fcntl (Windows) every process is its own leader, so only run a
+single worker there.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from .registry import JobStatus, SchedulerSnapshot
+except ImportError:
+    # Fallback for when running as a script
+    from registry import JobStatus, SchedulerSnapshot
+
+logger = logging.getLogger(__name__)
+
+RETRY_INTERVAL = 2.0   # Seconds between a follower's attempts to become leader
+SYNC_INTERVAL = 1.0    # Seconds between the leader's command checks and state writes
+COMMAND_TTL = 60       # Seconds after which an unhandled command is dropped
+COMMANDS = ('start', 'stop', 'restart', 'run_once')
+
+class LeaderLock:
+    """An exclusive, non-blocking lock on a file that also records the holder's pid."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """Take the lock if no other process holds it; True if this process now does"""
+        if self._file is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path, 'a+')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            # Closing the file releases the lock
+            self._file.close()
+            self._file = None
+
+def _parse_time(value):
+    return datetime.fromisoformat(value) if value else None
+
+def dump_snapshot(snapshot):
+    """A SchedulerSnapshot as a JSON-serializable dict"""
+    def time_str(value):
+        return value.isoformat() if value else None
+
+    return {
+        'running': snapshot.running,
+        'jobs': [
+            dict(job._asdict(), next_run=time_str(job.next_run), last_started=time_str(job.last_started))
+            for job in snapshot.jobs
+        ],
+        'next_run': time_str(snapshot.next_run),
+        'taken_at': time_str(snapshot.taken_at),
+    }
+
+def load_snapshot(data):
+    """The SchedulerSnapshot of a dict written by dump_snapshot"""
+    return SchedulerSnapshot(
+        running=data['running'],
+        jobs=tuple(
+            JobStatus(**dict(job, next_run=_parse_time(job['next_run']),
+                             last_started=_parse_time(job['last_started'])))
+            for job in data['jobs']
+        ),
+        next_run=_parse_time(data['next_run']),
+        taken_at=_parse_time(data['taken_at']),
+    )
+
+def write_json(path, data):
+    """Replace a JSON file atomically, so readers never see half of it"""
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(json.dumps(data), encoding='utf-8')
+    os.replace(temporary, path)
+
+class SchedulerLeader:
+    """Elects the worker that runs the scheduler and shares its state with the others.
+
+    ``scheduler_factory`` creates the ScrapingScheduler; it is only called
+    in the process that becomes leader.
+    """
+
+    def __init__(self, state_dir, scheduler_factory, retry_interval=RETRY_INTERVAL, sync_interval=SYNC_INTERVAL):
+        self.state_dir = Path(state_dir)
+        self.lock = LeaderLock(self.state_dir / 'scheduler.lock')
+        self.state_file = self.state_dir / 'scheduler_state.json'
+        self.commands_dir = self.state_dir / 'scheduler_commands'
+        self.scheduler_factory = scheduler_factory
+        self.retry_interval = retry_interval
+        self.sync_interval = sync_interval
+        self.scheduler = None        # Only on the leader
+        self._leading = False
+        self.desired_running = False
+        self._published = None       # (snapshot, desired_running) last written
+        self._state = (None, None)   # (mtime_ns, state) last read
+        self._command_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        return self._leading
+
+    def start(self):
+        """Take part in the election (try to become leader straight away, then in the background)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._try_lead()
+        self._thread = threading.Thread(target=self._run, name='scheduler-leader', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Leave the election; a leader stops its scheduler and hands over the lock."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self.is_leader:
+            if self.scheduler.running:
+                self.scheduler.stop()
+            # Keeps desired_running, so the next leader resumes the scheduler
+            self._publish(force=True)
+            self._leading = False
+            self.lock.release()
+            logger.info(f"👑 Scheduler leader (pid {os.getpid()}) stepped down")
+
+    def submit(self, action, **params):
+        """Carry out a command here if this is the leader, or pass it to the leader."""
+        if action not in COMMANDS:
+            raise ValueError(f"unknown scheduler command: {action}")
+        if self.is_leader:
+            self._execute(action, params)
+            self._publish()
+            return
+        self.commands_dir.mkdir(parents=True, exist_ok=True)
+        # Named by time, so the leader carries them out in the order received
+        name = f"{time.time_ns():020d}-{os.getpid()}.json"
+        write_json(self.commands_dir / name, {'action': action, 'params': params, 'submitted': time.time()})
+
+    def snapshot(self):
+        """The scheduler's latest SchedulerSnapshot, as seen from this process"""
+        if self.is_leader:
+            return self.scheduler.registry.snapshot()
+        state = self.shared_state()
+        if state is None:
+            return SchedulerSnapshot(running=False, jobs=(), next_run=None, taken_at=datetime.now())
+        return state['snapshot']
+
+    def leader_pid(self):
+        if self.is_leader:
+            return os.getpid()
+        state = self.shared_state()
+        return state['leader_pid'] if state else None
+
+    def shared_state(self):
+        """The state the leader last wrote (re-read only when the file changed), or None"""
+        try:
+            mtime = self.state_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if mtime != self._state[0]:
+            try:
+                data = json.loads(self.state_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                return self._state[1]
+            data['snapshot'] = load_snapshot(data['snapshot'])
+            self._state = (mtime, data)
+        return self._state[1]
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.is_leader or self._try_lead():
+                    self._run_commands()
+                    self._publish()
+            except Exception as e:
+                logger.error(f"❌ Error in scheduler leader election: {e}", exc_info=True)
+            self._stop.wait(self.sync_interval if self.is_leader else self.retry_interval)
+
+    def _try_lead(self):
+        """Become leader if the lock is free; resumes the scheduler if it should be running"""
+        if not self.lock.acquire():
+            return False
+        logger.info(f"👑 This worker (pid {os.getpid()}) is now the scheduler leader")
+        state = self.shared_state()
+        self.desired_running = bool(state and state.get('desired_running'))
+        self.scheduler = self.scheduler_factory()
+        if self.desired_running:
+            logger.info("🔁 Resuming the scheduler of the previous leader")
+            self.scheduler.start()
+        self._leading = True
+        self._publish(force=True)
+        return True
+
+    def _run_commands(self):
+        """Carry out the commands the other workers passed on, oldest first"""
+        try:
+            names = sorted(name for name in os.listdir(self.commands_dir) if name.endswith('.json'))
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = self.commands_dir / name
+            try:
+                command = json.loads(path.read_text(encoding='utf-8'))
+                path.unlink()
+            except (OSError, ValueError):
+                continue
+            if time.time() - command.get('submitted', 0) > COMMAND_TTL:
+                logger.warning(f"⚠️ Dropping expired scheduler command: {command.get('action')}")
+                continue
+            self._execute(command.get('action'), command.get('params', {}))
+
+    def _execute(self, action, params):
+        with self._command_lock:
+            scheduler = self.scheduler
+            if action in ('stop', 'restart') and scheduler.running:
+                scheduler.stop()
+            if action in ('start', 'restart') and not scheduler.running:
+                scheduler.start()
+            if action in ('start', 'stop', 'restart'):
+                self.desired_running = action != 'stop'
+            elif action == 'run_once':
+                # A scrape takes minutes; the leader keeps publishing while it runs
+                threading.Thread(target=scheduler.run_once, kwargs=params, daemon=True).start()
+            else:
+                logger.warning(f"⚠️ Ignoring unknown scheduler command: {action}")
+
+    def _publish(self, force=False):
+        """Write the shared state if the snapshot or the desired state changed"""
+        with self._publish_lock:
+            snapshot = self.scheduler.registry.snapshot()
+            if not force and self._published == (snapshot, self.desired_running):
+                return
+            self._published = (snapshot, self.desired_running)
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            write_json(self.state_file, {
+                'leader_pid': os.getpid(),
+                'desired_running': self.desired_running,
+                'snapshot': dump_snapshot(snapshot),
+            })
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Reading scheduler.log without loading it.
+
+The log is appended to for as long as the scheduler runs and is never
+rotated, so it is read from the end: ``read_logs`` seeks backwards in
+blocks and stops as soon as it has the records it needs, so its cost
+depends on how far back a request reaches, not on the size of the file.
+A record is a line starting with the log format's timestamp plus any
+continuation lines (tracebacks) after it. Records are filtered by
+minimum level and time range, and a request can continue further back
+from the ``next_cursor`` of the previous one (the byte offset of the
+oldest record returned).
+
+``RingBufferHandler`` writes the log file and also keeps the most recent
+records in memory with their offsets, so the usual request for the last
+few records is answered without touching the file. When several API
+workers append to the same log, a worker's buffer only holds its own
+records since another process last wrote, and is only used while no
+other process has written after them.
+"""
+import logging
+import os
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# asctime is "2025-07-13 14:30:22,123"
+RECORD_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) - (.*?) - ([A-Z]+) - ')
+BLOCK_SIZE = 64 * 1024
+BUFFER_RECORDS = 2000
+
+class LogEntry(NamedTuple):
+    offset: int
+    timestamp: Optional[datetime]
+    level: Optional[str]
+    text: str
+
+def parse_record(offset, text):
+    """Build a LogEntry from a record's text (first line in the log format)"""
+    match = RECORD_RE.match(text)
+    if not match:
+        return LogEntry(offset, None, None, text)
+    timestamp = datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S').replace(
+        microsecond=int(match.group(2)) * 1000
+    )
+    return LogEntry(offset, timestamp, match.group(4), text)
+
+def iter_records_backwards(path, before=None, block_size=BLOCK_SIZE):
+    """Yield the records of a log file that start before byte ``before``, newest first"""
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        position = f.tell() if before is None else min(before, f.tell())
+        partial = b''          # Start of the oldest line read so far, maybe incomplete
+        continuation = []      # Lines (newest first) waiting for the line that starts their record
+        while True:
+            read = min(block_size, position)
+            position -= read
+            f.seek(position)
+            lines = (f.read(read) + partial).split(b'\n')
+            if position:
+                # The first line may start in the previous block
+                partial = lines.pop(0)
+                offset = position + len(partial) + 1
+            else:
+                partial = b''
+                offset = 0
+            starts = []
+            for line in lines:
+                starts.append(offset)
+                offset += len(line) + 1
+            for start, line in zip(reversed(starts), reversed(lines)):
+                if not line:
+                    continue
+                text = line.decode('utf-8', errors='replace')
+                if not RECORD_RE.match(text):
+                    continuation.append(text)
+                    continue
+                yield parse_record(start, '\n'.join([text] + continuation[::-1]))
+                continuation = []
+            if not position:
+                if continuation:
+                    # Lines before the first record (e.g. the file was cut)
+                    yield parse_record(0, '\n'.join(continuation[::-1]))
+                return
+
+def level_number(name):
+    """Numeric value of a level name (0 if it is not one)"""
+    number = logging.getLevelName(name)
+    return number if isinstance(number, int) else 0
+
+def matches(entry, min_level, since, until):
+    """Whether an entry passes the level and time filters"""
+    if min_level and level_number(entry.level) < min_level:
+        return False
+    if entry.timestamp is not None:
+        if until and entry.timestamp > until:
+            return False
+        if since and entry.timestamp < since:
+            return False
+    return True
+
+def read_logs(path, limit=50, level=None, since=None, until=None, cursor=None, handler=None):
+    """Read the last ``limit`` records matching the filters.
+
+    level is a minimum level name (e.g. "WARNING" also returns errors);
+    since and until bound the record time; cursor continues before the
+    records of a previous call. If ``handler`` is the RingBufferHandler
+    writing ``path``, recent records are taken from its buffer.
+
+    Returns a tuple of (entries oldest first, next cursor or None).
+    """
+    min_level = level_number(level.upper()) if level else 0
+    found = []
+
+    def collect(entries):
+        """Add matching entries; True once done (limit reached or older than since)"""
+        for entry in entries:
+            if since and entry.timestamp is not None and entry.timestamp < since:
+                return True
+            if matches(entry, min_level, since, until):
+                found.append(entry)
+                if len(found) == limit:
+                    return True
+        return False
+
+    done = False
+    if handler is not None and cursor is None:
+        buffered, end = handler.recent_with_end()
+        # Another process may have written after the buffered records
+        if buffered and os.path.getsize(path) == end:
+            done = collect(reversed(buffered))
+            # The buffer holds the end of the file; older records are read from it
+            cursor = buffered[0].offset
+    if not done:
+        collect(iter_records_backwards(path, before=cursor))
+
+    next_cursor = found[-1].offset if len(found) == limit else None
+    return found[::-1], next_cursor
+
+class RingBufferHandler(logging.FileHandler):
+    """A FileHandler that also keeps its last ``capacity`` records in memory.
+
+    Each record is kept as a LogEntry with the byte offset it was written
+    at, so reads can continue in the file where the buffer ends. The
+    buffered records are always contiguous in the file: if a record does
+    not start where the previous one ended (another process wrote in
+    between), the buffer starts over from it.
+    """
+
+    def __init__(self, filename, capacity=BUFFER_RECORDS):
+        super().__init__(filename, encoding='utf-8')
+        self._records = deque(maxlen=capacity)
+        self._records_lock = threading.Lock()
+        self._end = None   # Offset after the last buffered record
+
+    def emit(self, record):
+        # Called with the handler lock held, so offsets follow the writes in order
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        super().emit(record)
+        if self.stream is None:
+            return
+        end = self.stream.tell()
+        entry = parse_record(end - len((text + self.terminator).encode('utf-8')), text)
+        with self._records_lock:
+            if entry.offset != self._end:
+                self._records.clear()
+            self._records.append(entry)
+            self._end = end
+
+    def recent(self):
+        """The buffered records, oldest first"""
+        return self.recent_with_end()[0]
+
+    def recent_with_end(self):
+        """The buffered records, oldest first, and the offset after the last of them"""
+        with self._records_lock:
+            return list(self._records), self._end
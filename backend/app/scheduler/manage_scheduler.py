@@ -32,7 +32,7 @@ def load_config(config_name):
     }
     return configs.get(config_name, SCHEDULER_CONFIG)
 
-def start_scheduler(config_name='default', custom_config=None):
+def start_scheduler(config_name='default', custom_config=None, workers=None):
     """Start the scheduler with specified configuration."""
     print(f"🚀 Starting scheduler with config: {config_name}")
     
@@ -42,7 +42,7 @@ def start_scheduler(config_name='default', custom_config=None):
     else:
         config = load_config(config_name)
     
-    scheduler = ScrapingScheduler(config)
+    scheduler = ScrapingScheduler(config, workers=workers)
     scheduler.start()
     
     print("✅ Scheduler started successfully")
@@ -56,16 +56,16 @@ def start_scheduler(config_name='default', custom_config=None):
         scheduler.stop()
         print("✅ Scheduler stopped")
 
-def run_once(days_back=3):
+def run_once(days_back=3, workers=None):
     """Run scraping once and exit."""
     print(f"🔄 Running scraping task once (days_back: {days_back})")
     
-    scheduler = ScrapingScheduler()
-    scheduler.run_scraping_task(days_back=days_back)
+    scheduler = ScrapingScheduler(workers=workers)
+    scheduler.run_once(days_back=days_back)
     print("✅ Task completed")
 
 def show_status():
-    """Show scheduler status and next runs."""
+    """Show the configured jobs and their next runs (without running anything)."""
     print("📊 Scheduler Status")
     print("=" * 50)
     
@@ -81,7 +81,7 @@ def show_status():
     print()
     
     for i, job in enumerate(jobs, 1):
-        print(f"{i}. Function: {job['function']}")
+        print(f"{i}. Job: {job['name']} ({job['description']})")
         print(f"   Interval: {job['interval']} {job['unit']}")
         if job['next_run']:
             print(f"   Next run: {job['next_run']}")
@@ -89,6 +89,9 @@ def show_status():
             if time_until.total_seconds() > 0:
                 print(f"   Time until: {time_until}")
         print()
+    
+    if scheduler.config.get('run_on_startup', False):
+        print("🚀 A scrape also runs when the scheduler starts")
 
 def show_configs():
     """Show available configurations."""
@@ -114,6 +117,9 @@ def create_custom_config():
         "default_days_back": 3,
         "run_on_startup": True,
         "startup_days_back": 3,
+        "workers": 8,
+        "fetch_content": False,
+        "incremental": True,
         "daily_scraping": {
             "enabled": True,
             "time": "09:00",
@@ -150,13 +156,15 @@ def main():
                        help='Path to custom configuration file')
     parser.add_argument('--days', type=int, default=3,
                        help='Number of days back to scrape (for run-once)')
+    parser.add_argument('--workers', type=int,
+                       help='Maximum number of sources fetched concurrently')
     
     args = parser.parse_args()
     
     if args.action == 'start':
-        start_scheduler(args.config, args.custom_config)
+        start_scheduler(args.config, args.custom_config, args.workers)
     elif args.action == 'run-once':
-        run_once(args.days)
+        run_once(args.days, args.workers)
     elif args.action == 'status':
         show_status()
     elif args.action == 'configs':
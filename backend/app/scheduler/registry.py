@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Registry of the scheduler's jobs and their runs.
+
+``JobRegistry`` owns a ``schedule.Scheduler`` of its own (not the global
+one of the schedule module), runs jobs through it and records for every
+job whether it is running and how its last run went. After every change
+it publishes an immutable ``SchedulerSnapshot``; ``snapshot()`` returns
+the latest one, so reading the status is O(1) and never schedules or
+runs anything.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
+import schedule
+
+class JobStatus(NamedTuple):
+    name: str
+    description: str
+    interval: Optional[int]
+    unit: Optional[str]
+    next_run: Optional[datetime]
+    running: bool
+    runs: int
+    last_started: Optional[datetime]
+    last_duration: Optional[float]   # Seconds
+    last_outcome: Optional[str]      # "success" or "error"
+
+class SchedulerSnapshot(NamedTuple):
+    running: bool
+    jobs: Tuple[JobStatus, ...]
+    next_run: Optional[datetime]
+    taken_at: datetime
+
+    @property
+    def job_running(self):
+        return any(job.running for job in self.jobs)
+
+class JobRegistry:
+    """Scheduled and one-off jobs, with an immutable snapshot of their state."""
+
+    def __init__(self):
+        self._scheduler = schedule.Scheduler()
+        self._lock = threading.Lock()
+        self._jobs = {}       # name -> (description, schedule.Job or None)
+        self._runs = {}       # name -> dict of run state
+        self._running = False
+        self._publish()
+
+    def add(self, name, description, trigger, task, **kwargs):
+        """Schedule ``task(**kwargs)`` under ``name``.
+
+        ``trigger`` is called with the registry's schedule.Scheduler and
+        returns the unscheduled job, e.g. ``lambda s: s.every().day.at("09:00")``.
+        """
+        with self._lock:
+            job = trigger(self._scheduler).do(self._tracked, name, task, **kwargs)
+            self._jobs[name] = (description, job)
+            self._runs.setdefault(name, self._new_run_state())
+        self._publish()
+
+    def run_now(self, name, description, task, **kwargs):
+        """Run ``task(**kwargs)`` once in the calling thread, recorded under ``name``"""
+        with self._lock:
+            self._jobs.setdefault(name, (description, None))
+            self._runs.setdefault(name, self._new_run_state())
+        return self._tracked(name, task, **kwargs)
+
+    def clear(self):
+        """Unschedule every job (the records of one-off runs are kept)"""
+        with self._lock:
+            self._scheduler.clear()
+            self._jobs = {name: (description, None) for name, (description, job) in self._jobs.items()
+                          if job is None}
+        self._publish()
+
+    def run_pending(self):
+        """Run the jobs that are due (see schedule.Scheduler.run_pending)"""
+        self._scheduler.run_pending()
+        # Jobs that ran have been given their next run time only now
+        self._publish()
+
+    def idle_seconds(self):
+        return self._scheduler.idle_seconds
+
+    def set_running(self, running):
+        with self._lock:
+            self._running = running
+        self._publish()
+
+    def snapshot(self):
+        """The latest SchedulerSnapshot"""
+        return self._snapshot
+
+    @staticmethod
+    def _new_run_state():
+        return {'running': False, 'runs': 0, 'last_started': None, 'last_duration': None, 'last_outcome': None}
+
+    def _tracked(self, name, task, **kwargs):
+        """Run a task, recording its start, duration and outcome.
+
+        A task reports failure by raising or by returning False.
+        """
+        with self._lock:
+            state = self._runs[name]
+            state.update(running=True, last_started=datetime.now())
+        self._publish()
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = task(**kwargs)
+            outcome = 'error' if result is False else 'success'
+            return result
+        finally:
+            with self._lock:
+                state.update(running=False, runs=state['runs'] + 1,
+                             last_duration=time.perf_counter() - start, last_outcome=outcome)
+            self._publish()
+
+    def _publish(self):
+        with self._lock:
+            jobs = tuple(
+                JobStatus(
+                    name=name,
+                    description=description,
+                    interval=job.interval if job else None,
+                    unit=job.unit if job else None,
+                    next_run=job.next_run if job else None,
+                    **self._runs[name],
+                )
+                for name, (description, job) in self._jobs.items()
+            )
+            next_runs = [job.next_run for job in jobs if job.next_run]
+            self._snapshot = SchedulerSnapshot(
+                running=self._running,
+                jobs=jobs,
+                next_run=min(next_runs) if next_runs else None,
+                taken_at=datetime.now(),
+            )
@@ -2,7 +2,6 @@
 """
 Scheduler module for running scraping tasks at configurable intervals.
 """
-import schedule
 import time
 import threading
 import logging
@@ -16,19 +15,35 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 # Import after adding to path
 try:
-    from app.scrapper.scrape_uk import fetch_and_store
+    from app.scrapper.scrape_uk import DB_PATH, fetch_and_store
+    from app.scrapper.http_client import configure_client
     from app.config.scheduler_config import SCHEDULER_CONFIG
+    from app.data.tiering import DEFAULT_HOT_DAYS, move_to_cold
 except ImportError:
     # Fallback for when running as module
-    from scrapper.scrape_uk import fetch_and_store
+    from scrapper.scrape_uk import DB_PATH, fetch_and_store
+    from scrapper.http_client import configure_client
     from config.scheduler_config import SCHEDULER_CONFIG
+    from data.tiering import DEFAULT_HOT_DAYS, move_to_cold
+
+try:
+    from .logs import LOG_FORMAT, RingBufferHandler
+    from .registry import JobRegistry
+except ImportError:
+    # Fallback for when running as a script
+    from logs import LOG_FORMAT, RingBufferHandler
+    from registry import JobRegistry
+
+LOG_FILE = 'scheduler.log'
+# Writes the log file and keeps its recent records in memory (see logs.py)
+log_handler = RingBufferHandler(LOG_FILE)
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('scheduler.log'),
+        log_handler,
         logging.StreamHandler()
     ]
 )
@@ -37,39 +52,84 @@ logger = logging.getLogger(__name__)
 class ScrapingScheduler:
     """Scheduler for running scraping tasks at configurable intervals."""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, workers=None):
         self.config = config or SCHEDULER_CONFIG
+        self.workers = workers or self.config.get('workers')
         self.running = False
         self.thread = None
+        self._stop = threading.Event()
+        # Owns the scheduled jobs and records their runs (see registry.py)
+        self.registry = JobRegistry()
+        # Shared pooled HTTP client, kept alive across scheduled runs
+        self.http_client = configure_client(
+            self.config.get('error_handling'), self.config.get('http')
+        )
+        
+    def run_scraping_task(self, days_back=None, incremental=False):
+        """Run the scraping task with error handling.
         
-    def run_scraping_task(self, days_back=None):
-        """Run the scraping task with error handling."""
+        In incremental mode each source is only scanned down to its last
+        seen article; days_back then only applies to sources without one.
+        Returns False if the task failed.
+        """
         try:
-            logger.info(f"🔄 Starting scheduled scraping task (days_back: {days_back})")
+            mode = "incremental" if incremental else "backfill"
+            logger.info(f"🔄 Starting scheduled scraping task (days_back: {days_back}, mode: {mode})")
             start_time = datetime.now()
             
             # Run the scraping task
-            fetch_and_store(days_back or self.config.get('default_days_back', 3))
+            fetch_and_store(
+                days_back or self.config.get('default_days_back', 3),
+                workers=self.workers,
+                fetch_content=self.config.get('fetch_content', False),
+                incremental=incremental
+            )
             
             end_time = datetime.now()
             duration = end_time - start_time
             logger.info(f"✅ Scraping task completed in {duration}")
             
+            stats = self.http_client.stats.snapshot()
+            logger.info(
+                f"🔌 HTTP totals: {stats['requests']} requests, "
+                f"{stats['connections_opened']} connections opened, "
+                f"{stats['connections_reused']} reused, {stats['retries']} retries"
+            )
+            
+            tiering = self.config.get('tiering', {})
+            if tiering.get('enabled', False):
+                moved = move_to_cold(DB_PATH, tiering.get('hot_days', DEFAULT_HOT_DAYS))
+                logger.info(f"🧊 Moved {moved} articles to the cold tier")
+            return True
+            
         except Exception as e:
             logger.error(f"❌ Error in scraping task: {e}", exc_info=True)
+            return False
+    
+    def run_once(self, days_back=None, incremental=False):
+        """Run the scraping task now, recorded in the registry as the "manual" job."""
+        return self.registry.run_now(
+            'manual', 'Manual run', self.run_scraping_task, days_back=days_back, incremental=incremental
+        )
     
     def schedule_jobs(self):
-        """Set up all scheduled jobs based on configuration."""
+        """Set up all scheduled jobs based on configuration.
+        
+        Only registers the jobs; nothing runs until the scheduler thread
+        is started (which also does the startup run).
+        """
         # Clear any existing jobs
-        schedule.clear()
+        self.registry.clear()
+        incremental = self.config.get('incremental', False)
         
         # Schedule daily scraping
         if self.config.get('daily_scraping', {}).get('enabled', True):
             time_str = self.config['daily_scraping'].get('time', '09:00')
             days_back = self.config['daily_scraping'].get('days_back', 3)
             
-            schedule.every().day.at(time_str).do(
-                self.run_scraping_task, days_back=days_back
+            self.registry.add(
+                'daily', f"Daily at {time_str}", lambda s: s.every().day.at(time_str),
+                self.run_scraping_task, days_back=days_back, incremental=incremental
             )
             logger.info(f"📅 Scheduled daily scraping at {time_str} (days_back: {days_back})")
         
@@ -77,51 +137,60 @@ class ScrapingScheduler:
         if self.config.get('hourly_scraping', {}).get('enabled', False):
             days_back = self.config['hourly_scraping'].get('days_back', 1)
             
-            schedule.every().hour.do(
-                self.run_scraping_task, days_back=days_back
+            self.registry.add(
+                'hourly', "Every hour", lambda s: s.every().hour,
+                self.run_scraping_task, days_back=days_back, incremental=incremental
             )
             logger.info(f"⏰ Scheduled hourly scraping (days_back: {days_back})")
         
         # Schedule custom intervals
-        for custom_job in self.config.get('custom_jobs', []):
+        for number, custom_job in enumerate(self.config.get('custom_jobs', []), 1):
             if custom_job.get('enabled', True):
                 interval = custom_job.get('interval', '1h')
                 days_back = custom_job.get('days_back', 3)
+                description = custom_job.get('description', f"Every {interval}")
                 
                 if interval.endswith('h'):
                     hours = int(interval[:-1])
-                    schedule.every(hours).hours.do(
-                        self.run_scraping_task, days_back=days_back
+                    self.registry.add(
+                        f'custom_{number}', description, lambda s, hours=hours: s.every(hours).hours,
+                        self.run_scraping_task, days_back=days_back, incremental=incremental
                     )
                     logger.info(f"🕐 Scheduled custom job every {hours} hours (days_back: {days_back})")
                 elif interval.endswith('m'):
                     minutes = int(interval[:-1])
-                    schedule.every(minutes).minutes.do(
-                        self.run_scraping_task, days_back=days_back
+                    self.registry.add(
+                        f'custom_{number}', description, lambda s, minutes=minutes: s.every(minutes).minutes,
+                        self.run_scraping_task, days_back=days_back, incremental=incremental
                     )
                     logger.info(f"⏱️ Scheduled custom job every {minutes} minutes (days_back: {days_back})")
+    
+    def run_scheduler(self):
+        """Run the scheduler in a loop (the startup run first, if configured)."""
+        self.running = True
+        self.registry.set_running(True)
+        logger.info("🎯 Scheduler started")
         
         # Run initial scraping if configured
         if self.config.get('run_on_startup', False):
             days_back = self.config.get('startup_days_back', 3)
             logger.info(f"🚀 Running initial scraping on startup (days_back: {days_back})")
-            self.run_scraping_task(days_back=days_back)
-    
-    def run_scheduler(self):
-        """Run the scheduler in a loop."""
-        self.running = True
-        logger.info("🎯 Scheduler started")
+            self.registry.run_now(
+                'startup', 'On startup', self.run_scraping_task,
+                days_back=days_back, incremental=self.config.get('incremental', False)
+            )
         
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                self.registry.run_pending()
+                self._stop.wait(60)  # Check every minute
             except KeyboardInterrupt:
                 logger.info("🛑 Scheduler stopped by user")
                 self.running = False
             except Exception as e:
                 logger.error(f"❌ Error in scheduler loop: {e}", exc_info=True)
-                time.sleep(60)  # Wait before retrying
+                self._stop.wait(60)  # Wait before retrying
+        self.registry.set_running(False)
     
     def start(self):
         """Start the scheduler in a separate thread."""
@@ -130,6 +199,8 @@ class ScrapingScheduler:
             return
         
         self.schedule_jobs()
+        self._stop.clear()
+        self.running = True
         self.thread = threading.Thread(target=self.run_scheduler, daemon=True)
         self.thread.start()
         logger.info("🚀 Scheduler started in background thread")
@@ -137,34 +208,24 @@ class ScrapingScheduler:
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._stop.set()
         if self.thread:
             self.thread.join(timeout=5)
         logger.info("🛑 Scheduler stopped")
     
     def get_next_run(self):
         """Get information about the next scheduled run."""
-        if not schedule.jobs:
-            return None
-        
-        next_job = schedule.next_run()
-        if next_job:
+        next_run = self.registry.snapshot().next_run
+        if next_run:
             return {
-                'next_run': next_job,
-                'time_until': next_job - datetime.now()
+                'next_run': next_run,
+                'time_until': next_run - datetime.now()
             }
         return None
     
     def get_job_info(self):
-        """Get information about all scheduled jobs."""
-        jobs_info = []
-        for job in schedule.jobs:
-            jobs_info.append({
-                'function': job.job_func.__name__,
-                'next_run': job.next_run,
-                'interval': str(job.interval),
-                'unit': job.unit
-            })
-        return jobs_info
+        """Get information about all jobs, including their last run."""
+        return [job._asdict() for job in self.registry.snapshot().jobs]
 
 def main():
     """Main function to run the scheduler."""
@@ -176,6 +237,8 @@ def main():
                        help='Run scraping once and exit')
     parser.add_argument('--days', type=int, default=3,
                        help='Number of days back to scrape (default: 3)')
+    parser.add_argument('--workers', type=int,
+                       help='Maximum number of sources fetched concurrently')
     
     args = parser.parse_args()
     
@@ -186,12 +249,12 @@ def main():
         with open(args.config, 'r') as f:
             config = json.load(f)
     
-    scheduler = ScrapingScheduler(config)
+    scheduler = ScrapingScheduler(config, workers=args.workers)
     
     if args.run_once:
         # Run once and exit
         logger.info("🔄 Running scraping task once")
-        scheduler.run_scraping_task(days_back=args.days)
+        scheduler.run_once(days_back=args.days)
         logger.info("✅ Task completed, exiting")
     else:
         # Start the scheduler
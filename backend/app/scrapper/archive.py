@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compressed, content-addressed archive of fetched listing pages.
+
+Every page body fetched by the scraper is stored once, gzip-compressed,
+under its SHA-256 (objects/ab/abcdef....gz); unchanged pages fetched again
+only add a row to the index. The index (index.db) records which source was
+fetched when and which object it returned, so ``scrape_uk.py reparse`` can
+replay the history through the parsing logic without the network.
+"""
+import argparse
+import gzip
+import hashlib
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from app.config.database_config import DB_PATH
+except ImportError:
+    from config.database_config import DB_PATH
+
+# Next to the database, so SCRAPER_DB_PATH moves the archive along with it
+ARCHIVE_DIR = Path(DB_PATH).parent / "archive"
+
+class PageArchive:
+    """Content-addressed page store with a fetch index. Safe to share between threads."""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS fetches (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          source_url TEXT NOT NULL,
+          fetched_at TIMESTAMP NOT NULL,
+          sha256 TEXT NOT NULL,
+          status INTEGER,
+          size INTEGER
+        );
+        """)
+        self._conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_fetches_source_time ON fetches (source_url, fetched_at)
+        """)
+        self._conn.commit()
+
+    def object_path(self, sha256):
+        return self.objects / sha256[:2] / f"{sha256}.gz"
+
+    def save(self, source_url, content, sha256=None, status=200, fetched_at=None):
+        """Archive a fetched page body; the object is written only if new"""
+        sha256 = sha256 or hashlib.sha256(content).hexdigest()
+        path = self.object_path(sha256)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+            tmp_path.replace(path)
+
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO fetches (source_url, fetched_at, sha256, status, size)
+                VALUES (?, ?, ?, ?, ?)
+            """, (source_url, fetched_at or datetime.utcnow(), sha256, status, len(content)))
+            self._conn.commit()
+        return sha256
+
+    def load(self, sha256):
+        """Read an archived page body"""
+        return gzip.decompress(self.object_path(sha256).read_bytes())
+
+    def fetches(self, source_url=None, since=None):
+        """List archived fetches as (source_url, fetched_at, sha256), oldest first"""
+        query = "SELECT source_url, fetched_at, sha256 FROM fetches WHERE 1 = 1"
+        params = []
+        if source_url:
+            query += " AND source_url = ?"
+            params.append(source_url)
+        if since:
+            query += " AND fetched_at >= ?"
+            params.append(since)
+        query += " ORDER BY fetched_at, id"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [(url, datetime.fromisoformat(fetched_at), sha256) for url, fetched_at, sha256 in rows]
+
+    def stats(self):
+        """Count fetches, distinct objects and bytes stored versus fetched"""
+        with self._lock:
+            fetch_count, object_count, fetched_bytes = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha256), COALESCE(SUM(size), 0) FROM fetches"
+            ).fetchone()
+        stored_bytes = sum(path.stat().st_size for path in self.objects.glob("*/*.gz"))
+        return {
+            'fetches': fetch_count,
+            'objects': object_count,
+            'fetched_bytes': fetched_bytes,
+            'stored_bytes': stored_bytes,
+        }
+
+    def close(self):
+        self._conn.close()
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_archive():
+    """Get the shared archive in ARCHIVE_DIR, opening it on first use"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = PageArchive(ARCHIVE_DIR)
+        return _archive
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect the archive of fetched pages')
+    parser.add_argument('--source', type=str, help='Only list fetches of this source URL')
+    parser.add_argument('--limit', type=int, default=20,
+                       help='Number of most recent fetches to list (default: 20)')
+    args = parser.parse_args()
+
+    archive = get_archive()
+    stats = archive.stats()
+    print(f"🗄️  Archive: {ARCHIVE_DIR}")
+    print(f"   Fetches: {stats['fetches']}, distinct pages stored: {stats['objects']}")
+    print(f"   Fetched: {stats['fetched_bytes']:,} bytes, stored: {stats['stored_bytes']:,} bytes")
+    print("=" * 80)
+    for source_url, fetched_at, sha256 in archive.fetches(args.source)[-args.limit:]:
+        print(f"{fetched_at:%Y-%m-%d %H:%M:%S}  {sha256[:12]}  {source_url}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Second scraping stage: fetch full article pages and store their main text.
+
+Articles whose ``content`` is still NULL are streamed from the database,
+newest first (so a backlog does not hold up the articles just scraped),
+fetched concurrently and reduced to their body text, then written back in
+batches. Memory stays bounded: at most ``max_queue`` articles wait on
+either side of the fetch workers, and responses are streamed and
+abandoned once they exceed ``max_bytes``.
+
+The stage is resumable: transient failures leave ``content`` NULL so the
+article is picked up again on the next run. Permanent failures (404/410,
+oversized or non-HTML responses) store an empty string so they are not
+retried forever.
+"""
+import argparse
+import queue
+import re
+import sys
+import threading
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+try:
+    from .http_client import get_client
+except ImportError:
+    # Fallback for when running as a script
+    from http_client import get_client
+
+# Connections and the write path live in app/data/writer.py
+sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from app.data.writer import connect, get_writer
+except ImportError:
+    from data.writer import connect, get_writer
+
+DEFAULT_CONTENT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024  # 2 MB per article page
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_LIMIT = 200  # Articles per run
+READ_PAGE_SIZE = 100
+CHUNK_SIZE = 64 * 1024
+
+# Main content containers, most specific first
+CONTENT_SELECTORS = [
+    '.govuk-govspeak',            # gov.uk news, guidance and statements
+    '.gem-c-govspeak',
+    '#contents',
+    'main#content',
+    '#main-content',
+    'article .article-body',      # Parliament news
+    'article',
+    'main',
+]
+
+# Boilerplate inside the main container on gov.uk/Parliament templates
+BOILERPLATE_SELECTORS = [
+    'script', 'style', 'noscript', 'template', 'form', 'nav', 'header', 'footer', 'aside',
+    '.govuk-breadcrumbs', '.gem-c-breadcrumbs', '.gem-c-contextual-breadcrumbs',
+    '.gem-c-contents-list', '.gem-c-print-link', '.gem-c-share-links',
+    '.gem-c-related-navigation', '.gem-c-contextual-sidebar', '.gem-c-metadata',
+    '.gem-c-single-page-notification-button', '.gem-c-feedback', '.gem-c-attachment__metadata',
+    '.govuk-skip-link', '.app-c-published-dates', '.app-c-back-to-top',
+    '.share-links', '.social-share', '.related-content', '.breadcrumb',
+]
+
+# Sentinel passed through the queues to signal the end of work
+DONE = object()
+
+class PermanentFetchError(Exception):
+    """The page will not become fetchable by retrying later"""
+
+def fetch_page(url, max_bytes=DEFAULT_MAX_BYTES):
+    """Stream an article page, refusing non-HTML or oversized responses"""
+    resp = get_client().get(url, stream=True)
+    try:
+        if resp.status_code in (404, 410):
+            raise PermanentFetchError(f"HTTP {resp.status_code}")
+        resp.raise_for_status()
+
+        content_type = resp.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type:
+            raise PermanentFetchError(f"not an HTML page ({content_type})")
+
+        declared = resp.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise PermanentFetchError(f"response too large ({declared} bytes)")
+
+        chunks = []
+        size = 0
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise PermanentFetchError(f"response larger than {max_bytes} bytes")
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        resp.close()
+
+def extract_main_text(content):
+    """Extract the main body text of an article page with boilerplate removed"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    root = None
+    for selector in CONTENT_SELECTORS:
+        root = soup.select_one(selector)
+        if root:
+            break
+    root = root or soup.body or soup
+
+    for tag in root.select(', '.join(BOILERPLATE_SELECTORS)):
+        tag.decompose()
+
+    text = root.get_text('\n', strip=True)
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+def produce(db_path, work, workers, limit):
+    """Stream articles without content onto the work queue, newest first, keyset-paginated by id"""
+    conn = connect(db_path)
+    try:
+        before_id = None
+        queued = 0
+        while queued < limit:
+            page_size = min(READ_PAGE_SIZE, limit - queued)
+            if before_id is None:
+                rows = conn.execute("""
+                    SELECT id, article_url FROM articles
+                    WHERE content IS NULL
+                    ORDER BY id DESC LIMIT ?
+                """, (page_size,)).fetchall()
+            else:
+                rows = conn.execute("""
+                    SELECT id, article_url FROM articles
+                    WHERE content IS NULL AND id < ?
+                    ORDER BY id DESC LIMIT ?
+                """, (before_id, page_size)).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                work.put(row)  # Blocks while the queue is full
+            before_id = rows[-1][0]
+            queued += len(rows)
+    finally:
+        conn.close()
+        for _ in range(workers):
+            work.put(DONE)
+
+def fetch_worker(work, results, max_bytes):
+    """Fetch and extract queued articles until the DONE sentinel arrives"""
+    while True:
+        item = work.get()
+        if item is DONE:
+            results.put(DONE)
+            return
+
+        article_id, url = item
+        try:
+            results.put((article_id, url, extract_main_text(fetch_page(url, max_bytes)), None))
+        except PermanentFetchError as e:
+            results.put((article_id, url, '', str(e)))
+        except requests.RequestException as e:
+            results.put((article_id, url, None, str(e)))
+        except Exception as e:
+            results.put((article_id, url, None, f"unexpected error: {e}"))
+
+def write_batch(writer, batch):
+    """Write a batch of (content, id) rows without overwriting content set meanwhile"""
+    if batch:
+        with writer.transaction() as cursor:
+            cursor.executemany(
+                "UPDATE articles SET content = ? WHERE id = ? AND content IS NULL", batch
+            )
+
+def fetch_missing_content(db_path, limit=DEFAULT_LIMIT, workers=DEFAULT_CONTENT_WORKERS,
+                          max_queue=DEFAULT_MAX_QUEUE, max_bytes=DEFAULT_MAX_BYTES,
+                          batch_size=DEFAULT_BATCH_SIZE):
+    """Fill in content for up to ``limit`` articles that have none yet.
+
+    Returns a dict with the number of articles stored, skipped permanently
+    and left for a later run.
+    """
+    work = queue.Queue(maxsize=max_queue)
+    results = queue.Queue(maxsize=max_queue)
+
+    threads = [threading.Thread(target=produce, args=(db_path, work, workers, limit), daemon=True)]
+    threads += [
+        threading.Thread(target=fetch_worker, args=(work, results, max_bytes), daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    print(f"\n📄 Fetching article content (up to {limit} articles, {workers} workers)")
+
+    summary = {'stored': 0, 'skipped': 0, 'retry_later': 0}
+    writer = get_writer(db_path)
+    batch = []
+    finished = 0
+    while finished < workers:
+        result = results.get()
+        if result is DONE:
+            finished += 1
+            continue
+
+        article_id, url, text, error = result
+        if text is None:
+            summary['retry_later'] += 1
+            print(f"⚠️  Will retry {url}: {error}")
+            continue
+        if error:
+            summary['skipped'] += 1
+            print(f"⏭️  Skipping {url}: {error}")
+        else:
+            summary['stored'] += 1
+
+        batch.append((text, article_id))
+        if len(batch) >= batch_size:
+            write_batch(writer, batch)
+            batch = []
+
+    write_batch(writer, batch)
+
+    for thread in threads:
+        thread.join()
+
+    print(f"📄 Content stored: {summary['stored']}, skipped: {summary['skipped']}, "
+          f"left for next run: {summary['retry_later']}")
+    return summary
+
+def main():
+    try:
+        from .scrape_uk import DB_PATH
+    except ImportError:
+        from scrape_uk import DB_PATH
+
+    parser = argparse.ArgumentParser(description='Fetch full content for stored articles')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT,
+                       help=f'Maximum number of articles to fetch (default: {DEFAULT_LIMIT})')
+    parser.add_argument('--workers', type=int, default=DEFAULT_CONTENT_WORKERS,
+                       help=f'Number of concurrent fetches (default: {DEFAULT_CONTENT_WORKERS})')
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES,
+                       help=f'Maximum article page size in bytes (default: {DEFAULT_MAX_BYTES})')
+
+    args = parser.parse_args()
+
+    fetch_missing_content(DB_PATH, limit=args.limit, workers=args.workers, max_bytes=args.max_bytes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Date parsing for listing pages.
+
+Handles the formats used by gov.uk and Parliament pages:
+
+- "11 July 2025", "3 Jul 2025", "11 July 2025 published amendments"
+- "Published 3 Jul 2025", "Updated: 11 July 2025 10:15", "11 July 2025 at 2:30pm"
+- "July 11, 2025"
+- "2025-07-11", "2025-07-11T10:15:00Z", "2025-07-11T10:15:00.000+01:00"
+- "11/07/2025" (DD/MM/YYYY)
+
+Patterns are compiled once, month names are resolved with a lookup table
+instead of a locale-dependent strptime, and results are memoized because
+the same date strings repeat across items and runs. Timezone offsets are
+dropped so the published wall-clock date is kept (and results stay naive
+like the rest of the database).
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+MONTHS = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+
+# Optional "10:15", "at 2:30pm" after a date
+TIME = r'(?:,?\s+(?:at\s+)?(?P<hour>\d{1,2})[:.](?P<minute>\d{2})\s*(?P<ampm>[ap]\.?m\.?)?)?'
+
+ISO_RE = re.compile(
+    r'(?<!\d)(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})'
+    r'(?:[T ](?P<hour>\d{2}):(?P<minute>\d{2})(?::(?P<second>\d{2})(?:\.\d+)?)?)?'
+)
+DAY_MONTH_YEAR_RE = re.compile(
+    r'(?<!\d)(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+(?P<month>[A-Za-z]+)\.?,?\s+(?P<year>\d{4})(?!\d)' + TIME,
+    re.IGNORECASE
+)
+MONTH_DAY_YEAR_RE = re.compile(
+    r'(?<![A-Za-z])(?P<month>[A-Za-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})(?!\d)' + TIME,
+    re.IGNORECASE
+)
+SLASH_RE = re.compile(r'(?<!\d)(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{4})(?!\d)')
+
+def _build(match, month):
+    """Build a datetime from a match and an already resolved month number"""
+    hour = int(match.group('hour') or 0) if 'hour' in match.re.groupindex else 0
+    minute = int(match.group('minute') or 0) if 'minute' in match.re.groupindex else 0
+    second = int(match.group('second') or 0) if 'second' in match.re.groupindex else 0
+
+    ampm = match.group('ampm') if 'ampm' in match.re.groupindex else None
+    if ampm:
+        if ampm[0].lower() == 'p' and hour < 12:
+            hour += 12
+        elif ampm[0].lower() == 'a' and hour == 12:
+            hour = 0
+
+    try:
+        return datetime(int(match.group('year')), month, int(match.group('day')), hour, minute, second)
+    except ValueError:
+        return None
+
+def _parse_named_month(regex, text):
+    for match in regex.finditer(text):
+        month = MONTHS.get(match.group('month').lower())
+        if month:
+            return _build(match, month)
+    return None
+
+@lru_cache(maxsize=4096)
+def _parse(text):
+    match = ISO_RE.search(text)
+    if match:
+        return _build(match, int(match.group('month')))
+
+    parsed = _parse_named_month(DAY_MONTH_YEAR_RE, text)
+    if parsed:
+        return parsed
+
+    match = SLASH_RE.search(text)
+    if match:
+        return _build(match, int(match.group('month')))
+
+    return _parse_named_month(MONTH_DAY_YEAR_RE, text)
+
+def parse_date(date_str):
+    """Parse a date string in any supported format, or return None"""
+    if not date_str:
+        return None
+    return _parse(date_str.strip())
+
+def parse_dates(date_strs):
+    """Parse a list of date strings in one call.
+
+    Each distinct string is parsed once; the result has one datetime (or
+    None) per input, in order.
+    """
+    unique = {date_str: parse_date(date_str) for date_str in set(date_strs)}
+    return [unique[date_str] for date_str in date_strs]
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the scraper and scheduler.
+
+A single long-lived requests.Session keeps connections alive between
+sources and between scheduler runs, so repeated requests to the same host
+(most sources are on www.gov.uk) skip TCP and TLS setup. Pools are sized
+per host, and transient failures are retried with jittered exponential
+backoff driven by the scheduler's "error_handling" config block.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 1.0  # Base delay in seconds, doubled on every attempt
+DEFAULT_RETRY_DELAY = 300  # Upper bound for a single backoff delay
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "next-step-app-scraper/0.1 (+https://github.com/olgagaga/next-step-app)"
+
+class HttpStats:
+    """Thread-safe counters for requests, opened connections and retries"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.retries = 0
+        self.failures = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections_opened,
+                'connections_reused': max(self.requests - self.connections_opened, 0),
+                'retries': self.retries,
+                'failures': self.failures,
+            }
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection to HttpStats"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.incr('connections_opened')
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.incr('connections_opened')
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+class HttpClient:
+    """Pooled, keep-alive HTTP client with retries.
+
+    Args:
+        error_handling: The scheduler "error_handling" block; uses
+            max_retries and retry_delay (the cap on a single backoff delay)
+        http: Optional "http" block with timeout, pool_maxsize (connections
+            kept per host), host_pool_sizes ({host: size} overrides) and
+            retry_backoff (base delay in seconds)
+    """
+
+    def __init__(self, error_handling=None, http=None):
+        error_handling = error_handling or {}
+        http = http or {}
+
+        self.max_retries = error_handling.get('max_retries', DEFAULT_MAX_RETRIES)
+        self.retry_delay = error_handling.get('retry_delay', DEFAULT_RETRY_DELAY)
+        self.retry_backoff = http.get('retry_backoff', DEFAULT_RETRY_BACKOFF)
+        self.timeout = http.get('timeout', DEFAULT_TIMEOUT)
+        self.stats = HttpStats()
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+
+        pool_maxsize = http.get('pool_maxsize', DEFAULT_POOL_MAXSIZE)
+        default_adapter = self._adapter(pool_maxsize)
+        self.session.mount('http://', default_adapter)
+        self.session.mount('https://', default_adapter)
+        for host, size in http.get('host_pool_sizes', {}).items():
+            adapter = self._adapter(size)
+            self.session.mount(f'http://{host}/', adapter)
+            self.session.mount(f'https://{host}/', adapter)
+
+    def _adapter(self, pool_maxsize):
+        # pool_block makes extra threads wait for a pooled connection instead
+        # of opening throwaway ones
+        return CountingAdapter(self.stats, pool_maxsize=pool_maxsize, pool_block=True)
+
+    def backoff(self, attempt, retry_after=None):
+        """Delay before retry number ``attempt`` (0-based), with full jitter"""
+        if retry_after is not None:
+            return min(retry_after, self.retry_delay)
+        return random.uniform(0, min(self.retry_delay, self.retry_backoff * 2 ** attempt))
+
+    def get(self, url, **kwargs):
+        """GET a URL, retrying connection errors, timeouts and 429/5xx responses"""
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            self.stats.incr('requests')
+            try:
+                resp = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    self.stats.incr('failures')
+                    raise
+                delay = self.backoff(attempt)
+            else:
+                if resp.status_code not in RETRY_STATUSES or last_attempt:
+                    return resp
+                retry_after = resp.headers.get('Retry-After')
+                delay = self.backoff(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None)
+                resp.close()
+
+            self.stats.incr('retries')
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def configure_client(error_handling=None, http=None):
+    """Replace the shared client with one built from the given config blocks"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(error_handling, http)
+        return _client
+
+def get_client():
+    """Get the shared client, creating it with defaults on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
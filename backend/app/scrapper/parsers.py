@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for listing pages.
+
+Each HTML source ("type": "html") in the config can pick a backend with the
+optional "parser" key:
+
+- "html.parser" (default): BeautifulSoup with Python's built-in parser
+- "lxml": BeautifulSoup with the lxml tree builder
+- "lxml-direct": lxml + cssselect, no BeautifulSoup tree at all
+
+Selectors are compiled and validated once, when a ListingParser is built
+for a source, instead of on every item of every run. Feed sources
+("atom"/"rss") are handled by feeds.FeedParser; parser_for() dispatches.
+"""
+import re
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+try:
+    from .feeds import FEED_TYPES, FeedParser
+except ImportError:
+    # Fallback for when running as a script
+    from feeds import FEED_TYPES, FeedParser
+
+try:
+    import lxml.html
+    from lxml import etree
+    from cssselect import GenericTranslator, SelectorError
+except ImportError:
+    lxml = None
+
+PARSERS = ('html.parser', 'lxml', 'lxml-direct')
+DEFAULT_PARSER = 'html.parser'
+
+# Item selectors made of a single tag/class compound (e.g. "li.item" or
+# ".govuk-accordion__section") can be used to parse only the matching
+# subtrees instead of the whole document
+SIMPLE_SELECTOR_RE = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<classes>(?:\.[\w-]+)+)?$')
+
+FIELDS = ('link_selector', 'title_selector', 'subtitle_selector', 'date_selector')
+
+def parser_for(src):
+    """Build the parser for a source according to its "type" ("html", "atom" or "rss")"""
+    source_type = src.get('type', 'html')
+    if source_type in FEED_TYPES:
+        return FeedParser(src)
+    if source_type != 'html':
+        raise ValueError(f"unknown source type '{source_type}'")
+    return ListingParser(src)
+
+def item_strainer(selector):
+    """Build a SoupStrainer for a simple item selector, or None if it is not simple"""
+    match = SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not (match.group('tag') or match.group('classes')):
+        return None
+
+    kwargs = {}
+    if match.group('classes'):
+        # The strainer only needs to over-approximate; the compiled selector
+        # is still applied to the strained tree
+        kwargs['class_'] = match.group('classes').split('.')[1]
+    return SoupStrainer(match.group('tag'), **kwargs)
+
+class ListingParser:
+    """Compiled selectors and parser backend for one source.
+
+    Raises ValueError if the backend is unknown or unavailable, or if any
+    selector is invalid.
+    """
+
+    def __init__(self, src):
+        self.label = src.get('label', src.get('url'))
+        self.parser = src.get('parser') or DEFAULT_PARSER
+        if self.parser not in PARSERS:
+            raise ValueError(f"unknown parser '{self.parser}' (expected one of {', '.join(PARSERS)})")
+
+        if self.parser == 'lxml' and builder_registry.lookup('lxml') is None:
+            raise ValueError("parser 'lxml' requires the lxml package")
+        if self.parser == 'lxml-direct' and lxml is None:
+            raise ValueError("parser 'lxml-direct' requires the lxml and cssselect packages")
+
+        self.selector = src['selector']
+        if self.parser == 'lxml-direct':
+            self.item_query = self._compile_xpath('selector', self.selector, 'descendant-or-self::')
+            self.queries = {
+                field: self._compile_xpath(field, src.get(field), 'descendant::') for field in FIELDS
+            }
+        else:
+            self.item_query = self._compile_css('selector', self.selector)
+            self.queries = {field: self._compile_css(field, src.get(field)) for field in FIELDS}
+            self.strainer = item_strainer(self.selector)
+
+    def _compile_css(self, field, selector):
+        if not selector:
+            return None
+        try:
+            return soupsieve.compile(selector)
+        except Exception as e:
+            raise ValueError(f"invalid {field} '{selector}': {e}")
+
+    def _compile_xpath(self, field, selector, prefix):
+        if not selector:
+            return None
+        try:
+            return etree.XPath(GenericTranslator().css_to_xpath(selector, prefix=prefix))
+        except (SelectorError, etree.XPathSyntaxError) as e:
+            raise ValueError(f"invalid {field} '{selector}': {e}")
+
+    def parse(self, content):
+        """Parse a listing page.
+
+        Returns the number of items matching the item selector and an
+        iterator over one dict per item with the raw href, title, subtitle
+        and date string. Items without a link are left out. Fields are only
+        extracted as the iterator advances, so callers that stop early (e.g.
+        at a watermark) skip the remaining items.
+        """
+        if self.parser == 'lxml-direct':
+            return self._parse_lxml(content)
+        return self._parse_soup(content)
+
+    def _parse_soup(self, content):
+        soup = BeautifulSoup(content, self.parser, parse_only=self.strainer)
+        items = self.item_query.select(soup)
+
+        def text(item, field, default):
+            query = self.queries[field]
+            tag = query.select_one(item) if query else None
+            return tag.get_text(strip=True) if tag else default
+
+        def entries():
+            for item in items:
+                link_query = self.queries['link_selector']
+                a_tag = link_query.select_one(item) if link_query else None
+                if not a_tag or not a_tag.get('href'):
+                    continue
+                yield {
+                    'href': a_tag['href'],
+                    'title': text(item, 'title_selector', 'No title found'),
+                    'subtitle': text(item, 'subtitle_selector', 'No subtitle'),
+                    'date_str': text(item, 'date_selector', 'No date'),
+                }
+        return len(items), entries()
+
+    def _parse_lxml(self, content):
+        doc = lxml.html.fromstring(content)
+        items = self.item_query(doc)
+
+        def first(item, field):
+            query = self.queries[field]
+            matches = query(item) if query else None
+            return matches[0] if matches else None
+
+        def text(item, field, default):
+            element = first(item, field)
+            if element is None:
+                return default
+            # Same result as BeautifulSoup's get_text(strip=True)
+            return ''.join(part.strip() for part in element.itertext() if part.strip())
+
+        def entries():
+            for item in items:
+                a_tag = first(item, 'link_selector')
+                if a_tag is None or not a_tag.get('href'):
+                    continue
+                yield {
+                    'href': a_tag.get('href'),
+                    'title': text(item, 'title_selector', 'No title found'),
+                    'subtitle': text(item, 'subtitle_selector', 'No subtitle'),
+                    'date_str': text(item, 'date_selector', 'No date'),
+                }
+        return len(items), entries()
@@ -1,53 +1,102 @@
 #!/usr/bin/env python3
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime, date, timedelta
 from pathlib import Path
+import hashlib
 import json
-import re
 import sqlite3
 import argparse
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# Database configuration
-DB_PATH = str(Path(__file__).parent.parent / "data" / "scraper.db")
+try:
+    from .archive import get_archive
+    from .content import fetch_missing_content
+    from .dates import parse_date
+    from .http_client import get_client
+    from .parsers import parser_for
+except ImportError:
+    # Fallback for when running as a script
+    from archive import get_archive
+    from content import fetch_missing_content
+    from dates import parse_date
+    from http_client import get_client
+    from parsers import parser_for
+
+# The schema lives in app/data/migrations.py
+sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from app.config.database_config import DB_PATH
+    from app.data.migrations import migrate
+    from app.data.writer import connect, get_writer
+except ImportError:
+    from config.database_config import DB_PATH
+    from data.migrations import migrate
+    from data.writer import connect, get_writer
+
+# Database configuration (DB_PATH is shared with the API, see config/database_config.py)
+CONFIG_PATH = Path(__file__).parent.parent / 'config' / 'uk.json'
+
+# Concurrency configuration
+DEFAULT_WORKERS = 8  # Maximum number of sources fetched at once
+PARSE_WORKERS = min(4, os.cpu_count() or 1)  # Threads reserved for HTML parsing
 
 def initialize_db():
-    """Initialize database if it doesn't exist"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create tables if they don't exist
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS sources (
-      id INTEGER PRIMARY KEY AUTOINCREMENT,
-      label TEXT NOT NULL,
-      url TEXT NOT NULL UNIQUE,
-      type TEXT NOT NULL,
-      selector TEXT,
-      link_selector TEXT,
-      title_selector TEXT,
-      subtitle_selector TEXT,
-      date_selector TEXT,
-      last_scraped TIMESTAMP
-    );
-    """)
+    """Create the database if it doesn't exist and bring its schema up to date"""
+    migrate(DB_PATH)
+
+def get_http_cache(cursor):
+    """Get stored ETag, Last-Modified and content hash for every source, keyed by source ID"""
+    cursor.execute("SELECT id, etag, last_modified, content_hash FROM sources")
+    return {
+        row[0]: {'etag': row[1], 'last_modified': row[2], 'content_hash': row[3]}
+        for row in cursor.fetchall()
+    }
 
+def get_watermarks(cursor):
+    """Get each source's high-watermark as (newest date_published, its article_url), keyed by source ID"""
     cursor.execute("""
-    CREATE TABLE IF NOT EXISTS articles (
-      id INTEGER PRIMARY KEY AUTOINCREMENT,
-      source_id INTEGER NOT NULL REFERENCES sources(id),
-      article_url TEXT NOT NULL UNIQUE,
-      title TEXT NOT NULL,
-      subtitle TEXT,
-      date_published DATE,
-      date_fetched TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-      content TEXT
-    );
+        SELECT id, hwm_date_published, hwm_article_url FROM sources
+        WHERE hwm_date_published IS NOT NULL
     """)
-    
-    conn.commit()
-    conn.close()
+    return {
+        row[0]: (datetime.fromisoformat(row[1]), row[2])
+        for row in cursor.fetchall()
+    }
+
+def newest_entry(entries, end_date):
+    """Find the newest (date_published, article_url) among entries not dated after end_date"""
+    newest = None
+    for entry in entries:
+        date_published = entry['date_published']
+        if date_published and date_published.date() <= end_date:
+            if newest is None or date_published > newest[0]:
+                newest = (date_published, entry['article_url'])
+    return newest
+
+def update_watermark(cursor, src_id, watermark, entries, end_date):
+    """Advance a source's watermark to the newest stored entry; it never moves back"""
+    newest = newest_entry(entries, end_date)
+    if newest and (watermark is None or newest[0] >= watermark[0]):
+        cursor.execute("""
+            UPDATE sources SET hwm_date_published = ?, hwm_article_url = ? WHERE id = ?
+        """, (newest[0], newest[1], src_id))
+
+def reached_watermark(entry, watermark):
+    """Check whether a listing entry is at or past the source's watermark.
+
+    Listings are newest first, so everything from the watermark article
+    (at its recorded date) or from the first older item onwards was
+    already seen. A watermark article that reappears with a newer date
+    (an updated page) does not stop the scan.
+    """
+    hwm_date, hwm_url = watermark
+    date_published = entry['date_published']
+    if entry['article_url'] == hwm_url and date_published == hwm_date:
+        return True
+    return date_published is not None and date_published < hwm_date
 
 def get_source_id(cursor, url):
     """Get source ID from database"""
@@ -55,57 +104,283 @@ def get_source_id(cursor, url):
     result = cursor.fetchone()
     return result[0] if result else None
 
-def article_exists(cursor, article_url):
-    """Check if article already exists in database"""
-    cursor.execute("SELECT id FROM articles WHERE article_url = ?", (article_url,))
-    return cursor.fetchone() is not None
+class KnownUrlCache:
+    """In-memory set of article URLs known to be stored, per database file.
 
-def add_article(cursor, source_id, article_url, title, subtitle, date_published):
-    """Add new article to database"""
-    try:
-        cursor.execute("""
-            INSERT INTO articles (source_id, article_url, title, subtitle, date_published)
-            VALUES (?, ?, ?, ?, ?)
-        """, (source_id, article_url, title, subtitle, date_published))
+    Only URLs confirmed to exist are cached (articles are never deleted),
+    so a hit is always exact and a miss falls back to the database. The
+    cache lives at module level and stays warm across scheduler runs.
+    """
+
+    def __init__(self):
+        self._urls = {}
+
+    def urls(self, db_path):
+        return self._urls.setdefault(db_path, set())
+
+    def clear(self):
+        self._urls.clear()
+
+KNOWN_URLS = KnownUrlCache()
+
+# Stay well below SQLite's host parameter limit in IN (...) lookups
+LOOKUP_CHUNK_SIZE = 500
+
+def existing_article_urls(cursor, article_urls):
+    """Return the subset of article_urls already stored in the database"""
+    known = KNOWN_URLS.urls(DB_PATH)
+    found = {url for url in article_urls if url in known}
+    missing = list({url for url in article_urls if url not in known})
+
+    for start in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+        chunk = missing[start:start + LOOKUP_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        # Articles moved to the cold tier are known too (the writer attaches it)
+        cursor.execute(f"""
+            SELECT article_url FROM articles WHERE article_url IN ({placeholders})
+            UNION ALL
+            SELECT article_url FROM cold.articles WHERE article_url IN ({placeholders})
+        """, chunk + chunk)
+        found.update(row[0] for row in cursor.fetchall())
+
+    known.update(found)
+    return found
+
+def add_articles(cursor, rows):
+    """Insert (source_id, article_url, title, subtitle, date_published) rows in one batch.
+
+    Returns the number of rows actually inserted; rows whose URL is
+    already stored are ignored.
+    """
+    if not rows:
+        return 0
+    cursor.executemany("""
+        INSERT OR IGNORE INTO articles (source_id, article_url, title, subtitle, date_published)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
+    inserted = cursor.rowcount
+    KNOWN_URLS.urls(DB_PATH).update(row[1] for row in rows)
+    return inserted
+
+# Loaded configs and their compiled parsers, keyed by path
+_CONFIG_CACHE = {}
+
+def load_config(config_path=None):
+    """Load the sources config (defaults to config/uk.json) and compile its selectors.
+
+    Returns the config and a list with one entry per source: its
+    ListingParser or FeedParser, or the ValueError raised while compiling it. The result
+    is cached until the file changes on disk, so selectors are compiled
+    once rather than on every run.
+    """
+    config_path = str(config_path or CONFIG_PATH)
+    mtime = os.path.getmtime(config_path)
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    parsers = []
+    for src in config["updates"]:
+        try:
+            parsers.append(parser_for(src))
+        except (KeyError, ValueError) as e:
+            parsers.append(ValueError(str(e)))
+
+    _CONFIG_CACHE[config_path] = (mtime, config, parsers)
+    return config, parsers
+
+def fetch_source(url, cache=None):
+    """Download a source listing page with a conditional GET.
+
+    ``cache`` holds the validators stored for the source on its last run.
+    Returns a dict with the HTTP status, the body (None on 304), the new
+    validators and a SHA-256 hash of the body.
+    """
+    cache = cache or {}
+    headers = {}
+    if cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+    if cache.get('last_modified'):
+        headers['If-Modified-Since'] = cache['last_modified']
+
+    resp = get_client().get(url, headers=headers)
+    if resp.status_code == 304:
+        return {
+            'status': 304,
+            'content': None,
+            'etag': resp.headers.get('ETag', cache.get('etag')),
+            'last_modified': resp.headers.get('Last-Modified', cache.get('last_modified')),
+            'content_hash': cache.get('content_hash'),
+        }
+
+    resp.raise_for_status()
+    return {
+        'status': resp.status_code,
+        'content': resp.content,
+        'etag': resp.headers.get('ETag'),
+        'last_modified': resp.headers.get('Last-Modified'),
+        'content_hash': hashlib.sha256(resp.content).hexdigest(),
+    }
+
+def is_unchanged(page, cache):
+    """Check whether a fetched page is the same as on the last run"""
+    if page['status'] == 304:
         return True
-    except sqlite3.IntegrityError:
-        # Article already exists
-        return False
-
-def parse_date(date_str):
-    """Parse date string in various formats"""
-    if not date_str:
-        return None
-        
-    date_str_clean = date_str.strip()
-    
+    return bool(cache) and page['content_hash'] == cache.get('content_hash')
+
+def parse_listing(content, src, parser, watermark=None):
+    """Extract listing items from a fetched page.
+
+    Runs on the parse pool, so it only returns plain values: the number of
+    items matching the source selector, one dict per item with a link, and
+    whether extraction stopped at the source's ``watermark`` (in which case
+    the items after it are never extracted).
+    """
+    item_count, items = parser.parse(content)
+
+    entries = []
+    for item in items:
+        entry = {
+            'article_url': urljoin(src['url'], item['href']),
+            'title': item['title'],
+            'subtitle': item['subtitle'],
+            'date_str': item['date_str'],
+            # Feed entries come with a structured date already parsed
+            'date_published': item['date_published'] if 'date_published' in item else parse_date(item['date_str']),
+        }
+        if watermark and reached_watermark(entry, watermark):
+            return item_count, entries, True
+        entries.append(entry)
+
+    return item_count, entries, False
+
+def archive_page(archive, url, page):
+    """Store a fetched page body in the archive; a failing archive never fails the scrape"""
     try:
-        # Format: "11 July 2025" or "11 July 2025 published amendments"
-        if re.match(r'\d{1,2}\s+\w+\s+\d{4}', date_str_clean):
-            date_match = re.search(r'(\d{1,2}\s+\w+\s+\d{4})', date_str_clean)
-            if date_match:
-                date_str_clean = date_match.group(1)
-                return datetime.strptime(date_str_clean, '%d %B %Y')
-        
-        # Format: "2025-07-11" (ISO format)
-        elif re.match(r'\d{4}-\d{2}-\d{2}', date_str_clean):
-            return datetime.fromisoformat(date_str_clean)
-        
-        # Format: "11/07/2025" (DD/MM/YYYY)
-        elif re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str_clean):
-            return datetime.strptime(date_str_clean, '%d/%m/%Y')
-            
-    except Exception:
-        pass
-    
-    return None
+        archive.save(url, page['content'], page['content_hash'], page['status'])
+    except (OSError, sqlite3.Error) as e:
+        print(f"⚠️  Could not archive {url}: {e}")
+
+def submit_source(fetch_pool, parse_pool, src, parser, cache=None, watermark=None, archive=None):
+    """Queue a source on the fetch pool and chain its parsing onto the parse pool.
+
+    Returns a future resolving to ``(page, parsed)`` where ``page`` is the
+    result of ``fetch_source`` and ``parsed`` the result of ``parse_listing``,
+    or None when the page is unchanged since the last run. Fetch threads
+    hand the body over and move on to the next source, so slow parsing
+    never holds a fetch slot. Bodies are written to ``archive`` (if given)
+    on the fetch thread.
+    """
+    result = Future()
 
-def fetch_and_store(days_back=3):
-    """Fetch articles from the last N days and store in database"""
+    def on_fetched(fetch_future):
+        try:
+            page = fetch_future.result()
+            if archive is not None and page['content'] is not None:
+                archive_page(archive, src['url'], page)
+            if is_unchanged(page, cache):
+                result.set_result((page, None))
+                return
+            parse_future = parse_pool.submit(parse_listing, page['content'], src, parser, watermark)
+            parse_future.add_done_callback(lambda f: on_parsed(page, f))
+        except BaseException as e:
+            result.set_exception(e)
+
+    def on_parsed(page, parse_future):
+        try:
+            result.set_result((page, parse_future.result()))
+        except BaseException as e:
+            result.set_exception(e)
+
+    fetch_pool.submit(fetch_source, src['url'], cache).add_done_callback(on_fetched)
+    return result
+
+def store_items(cursor, src_id, entries, start_date, end_date, days_back):
+    """Store parsed listing items that fall within the date range.
+
+    Existing URLs are looked up in one batch up front and new rows are
+    inserted with a single executemany.
+
+    Returns a tuple of (articles in date range, new articles added).
+    """
+    in_range_count = 0
+    existing = existing_article_urls(cursor, [entry['article_url'] for entry in entries])
+    rows = []
+
+    for entry in entries:
+        article_url = entry['article_url']
+
+        # Check if article already exists (or was already queued from this page)
+        if article_url in existing:
+            continue
+
+        title = entry['title']
+        subtitle = entry['subtitle']
+        date_published = entry['date_published']
+
+        if date_published:
+            # Check if within date range
+            article_date = date_published.date()
+            if start_date <= article_date <= end_date:
+                in_range_count += 1
+                print(f"\n--- Item {in_range_count} (Date: {article_date}) ---")
+                print(f"🔗 URL: {article_url}")
+                print(f"📰 Title: {title}")
+                print(f"📝 Subtitle: {subtitle}")
+                print(f"📅 Date: {date_published.strftime('%Y-%m-%d')}")
+
+                rows.append((src_id, article_url, title, subtitle, date_published))
+                existing.add(article_url)
+            else:
+                # Article is outside our date range
+                if article_date < start_date:
+                    # Stop processing older articles (assuming they're sorted by date)
+                    print(f"📅 Reached articles older than {days_back} days, stopping...")
+                    break
+        else:
+            print(f"❌ Could not parse date: '{entry['date_str']}'")
+
+    # Add to database
+    new_articles_count = add_articles(cursor, rows)
+    if new_articles_count:
+        print(f"\n✅ Added {new_articles_count} new articles to database")
+    if new_articles_count < len(rows):
+        print(f"⚠️  {len(rows) - new_articles_count} articles already exist in database")
+
+    return in_range_count, new_articles_count
+
+def fetch_and_store(days_back=3, workers=None, config_path=None, force=False, fetch_content=False,
+                    incremental=False, archive_pages=True):
+    """Fetch articles from the last N days and store in database
+
+    Sources are fetched concurrently on a pool of ``workers`` threads (at
+    most that many requests in flight at once) and parsed on a separate
+    pool. Results are written to the database in config order, so the
+    per-source summaries and stored rows match a serial run.
+
+    Fetches are conditional on the ETag/Last-Modified stored for each
+    source; pages that come back 304 or with an unchanged body hash are
+    reported as unchanged and not parsed. Pass ``force=True`` to ignore
+    the stored validators, e.g. for a backfill with a larger ``days_back``.
+
+    Each source keeps a high-watermark (newest date_published and its
+    article_url). With ``incremental=True`` a source with a watermark is
+    scanned only down to it, so a run touches only new items; ``days_back``
+    then only applies to sources that have no watermark yet (backfill).
+
+    With ``fetch_content=True`` the article pages of stored articles that
+    have no content yet are fetched afterwards (see content.py).
+
+    Every fetched listing body is kept in the page archive (see archive.py)
+    unless ``archive_pages=False``, so it can be re-parsed later with
+    ``reparse_archive``.
+    """
     # Load config
-    config_path = Path(__file__).parent.parent / 'config' / 'uk.json'
-    with open(config_path, 'r') as f:
-        CONFIG = json.load(f)
+    CONFIG, parsers = load_config(config_path)
+    workers = workers or DEFAULT_WORKERS
     
     # Initialize database
     initialize_db()
@@ -114,140 +389,258 @@ def fetch_and_store(days_back=3):
     end_date = date.today()
     start_date = end_date - timedelta(days=days_back)
     
-    print(f"🚀 Starting UK scraper - tracking sources from last {days_back} days")
+    if incremental:
+        print(f"🚀 Starting UK scraper - incremental mode (backfilling {days_back} days for new sources)")
+    else:
+        print(f"🚀 Starting UK scraper - tracking sources from last {days_back} days")
     print("=" * 80)
     print(f"📅 Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    print(f"⚙️  Fetch workers: {workers}, parse workers: {PARSE_WORKERS}")
     print("=" * 80)
     
-    # Connect to database
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Read the per-source state; every write goes through the writer, one transaction per source
+    conn = connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        http_cache = {} if force else get_http_cache(cursor)
+        watermarks = get_watermarks(cursor)
+    finally:
+        conn.close()
+    writer = get_writer(DB_PATH)
     
     total_new_articles = 0
+    unchanged_sources = 0
+    http_stats_before = get_client().stats.snapshot()
+    write_stats_before = writer.stats()
+    archive = get_archive() if archive_pages else None
     
-    for i, src in enumerate(CONFIG["updates"], 1):
-        src_id, url, sel, link_sel, title_sel, sub_sel, date_sel = (
-            i, src['url'], src['selector'], src['link_selector'], 
-            src['title_selector'], src['subtitle_selector'], src['date_selector']
-        )
-        
-        print(f"\n🔍 Scraping source: {url}")
-        print(f"   Label: {src.get('label', 'No label')}")
-        print(f"   Selector: {sel}")
-        print(f"   Link selector: {link_sel}")
-        print(f"   Title selector: {title_sel}")
-        print(f"   Subtitle selector: {sub_sel}")
-        print(f"   Date selector: {date_sel}")
-        print("-" * 60)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fetch') as fetch_pool, \
+         ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix='parse') as parse_pool:
+        # Start every source up front; results are consumed below in config order
+        pending = []
+        for i, (src, parser) in enumerate(zip(CONFIG["updates"], parsers), 1):
+            if src.get('type', 'html') == 'html' and not (
+                src['selector'] and src['link_selector'] and src['title_selector']
+            ):
+                pending.append(None)
+            elif isinstance(parser, ValueError):
+                pending.append(parser)
+            else:
+                watermark = watermarks.get(i) if incremental else None
+                pending.append(submit_source(fetch_pool, parse_pool, src, parser, http_cache.get(i), watermark, archive))
         
-        # Skip if essential selectors are missing
-        if not sel or not link_sel or not title_sel:
-            print("⚠️  Skipping source - missing essential selectors")
-            continue
-        
-        try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.content, 'html.parser')
-
-            items = soup.select(sel)
-            print(f"📊 Found {len(items)} items matching selector '{sel}'")
+        for i, (src, future) in enumerate(zip(CONFIG["updates"], pending), 1):
+            src_id, url, sel, link_sel, title_sel, sub_sel, date_sel = (
+                i, src['url'], src.get('selector'), src.get('link_selector'), 
+                src.get('title_selector'), src.get('subtitle_selector'), src.get('date_selector')
+            )
             
-            new_articles_count = 0
-            in_range_count = 0
+            print(f"\n🔍 Scraping source: {url}")
+            print(f"   Label: {src.get('label', 'No label')}")
+            if src.get('type', 'html') == 'html':
+                print(f"   Selector: {sel}")
+                print(f"   Link selector: {link_sel}")
+                print(f"   Title selector: {title_sel}")
+                print(f"   Subtitle selector: {sub_sel}")
+                print(f"   Date selector: {date_sel}")
+                print(f"   Parser: {src.get('parser') or 'html.parser'}")
+            else:
+                print(f"   Type: {src['type']} feed")
+            print("-" * 60)
             
-            for item in items:
-                # Try to find link
-                a_tag = item.select_one(link_sel)
-                if not a_tag or not a_tag.get('href'):
-                    continue
-
-                article_url = urljoin(url, a_tag['href'])
-                
-                # Check if article already exists
-                if article_exists(cursor, article_url):
-                    continue
-                
-                # Try to find title
-                title_tag = item.select_one(title_sel)
-                title = title_tag.get_text(strip=True) if title_tag else 'No title found'
-                
-                # Try to find subtitle
-                subtitle_tag = item.select_one(sub_sel) if sub_sel else None
-                subtitle = subtitle_tag.get_text(strip=True) if subtitle_tag else 'No subtitle'
+            # Skip if essential selectors are missing
+            if future is None:
+                print("⚠️  Skipping source - missing essential selectors")
+                continue
+            if isinstance(future, ValueError):
+                print(f"⚠️  Skipping source - {future}")
+                continue
+            
+            try:
+                page, parsed = future.result()
                 
-                # Try to find date
-                date_tag = item.select_one(date_sel) if date_sel else None
-                date_str = date_tag.get_text(strip=True) if date_tag else 'No date'
+                # A failing source rolls back only its own writes
+                with writer.transaction() as cursor:
+                    if parsed is None:
+                        unchanged_sources += 1
+                        reason = "304 Not Modified" if page['status'] == 304 else "same content hash"
+                        print(f"⏸️  Source unchanged since last run ({reason}), skipping")
+                        print(f"\n📈 Summary for {url}: unchanged")
+                        cursor.execute("""
+                            UPDATE sources SET last_scraped = ?, etag = ?, last_modified = ? WHERE id = ?
+                        """, (datetime.utcnow(), page['etag'], page['last_modified'], src_id))
+                        continue
+                    
+                    item_count, entries, stopped_at_watermark = parsed
+                    if sel:
+                        print(f"📊 Found {item_count} items matching selector '{sel}'")
+                    else:
+                        print(f"📊 Found {item_count} feed entries")
+                    
+                    watermark = watermarks.get(src_id)
+                    source_start_date = start_date
+                    if incremental and watermark:
+                        source_start_date = watermark[0].date()
+                        print(f"🔖 Watermark: {watermark[0].strftime('%Y-%m-%d')} ({watermark[1]})")
+                        if stopped_at_watermark:
+                            print(f"🔖 Reached last seen article after {len(entries)} new items, stopping...")
+                    
+                    in_range_count, new_articles_count = store_items(
+                        cursor, src_id, entries, source_start_date, end_date, days_back
+                    )
+                    update_watermark(cursor, src_id, watermark, entries, end_date)
+                    
+                    # Update last_scraped timestamp and HTTP cache validators
+                    cursor.execute("""
+                        UPDATE sources
+                        SET last_scraped = ?, etag = ?, last_modified = ?, content_hash = ?
+                        WHERE id = ?
+                    """, (datetime.utcnow(), page['etag'], page['last_modified'], page['content_hash'], src_id))
                 
-                # Parse date
-                date_published = parse_date(date_str)
+                total_new_articles += new_articles_count
+                print(f"\n📈 Summary for {url}:")
+                print(f"   Total items found: {item_count}")
+                print(f"   Articles in date range: {in_range_count}")
+                print(f"   New articles added: {new_articles_count}")
                 
-                if date_published:
-                    # Check if within date range
-                    article_date = date_published.date()
-                    if start_date <= article_date <= end_date:
-                        in_range_count += 1
-                        print(f"\n--- Item {in_range_count} (Date: {article_date}) ---")
-                        print(f"🔗 URL: {article_url}")
-                        print(f"📰 Title: {title}")
-                        print(f"📝 Subtitle: {subtitle}")
-                        print(f"📅 Date: {date_published.strftime('%Y-%m-%d')}")
-                        
-                        # Add to database
-                        if add_article(cursor, src_id, article_url, title, subtitle, date_published):
-                            new_articles_count += 1
-                            total_new_articles += 1
-                            print(f"✅ Added new article to database")
-                        else:
-                            print(f"⚠️  Article already exists in database")
-                    else:
-                        # Article is outside our date range
-                        if article_date < start_date:
-                            # Stop processing older articles (assuming they're sorted by date)
-                            print(f"📅 Reached articles older than {days_back} days, stopping...")
-                            break
-                else:
-                    print(f"❌ Could not parse date: '{date_str}'")
-            
-            print(f"\n📈 Summary for {url}:")
-            print(f"   Total items found: {len(items)}")
-            print(f"   Articles in date range: {in_range_count}")
-            print(f"   New articles added: {new_articles_count}")
-            
-            # Update last_scraped timestamp
-            cursor.execute("UPDATE sources SET last_scraped = ? WHERE id = ?", (datetime.utcnow(), src_id))
-            
-        except requests.RequestException as e:
-            print(f"❌ Error fetching {url}: {e}")
-        except Exception as e:
-            print(f"❌ Unexpected error processing {url}: {e}")
-    
-    # Commit all changes
-    conn.commit()
-    conn.close()
+            except requests.RequestException as e:
+                print(f"❌ Error fetching {url}: {e}")
+            except Exception as e:
+                # URLs cached while storing the source may have been rolled back
+                KNOWN_URLS.clear()
+                print(f"❌ Unexpected error processing {url}: {e}")
     
     print("\n" + "=" * 80)
     print(f"✅ Scraping complete!")
     print(f"📊 Total new articles added: {total_new_articles}")
+    print(f"⏸️  Sources unchanged since last run: {unchanged_sources}")
+    http_stats = get_client().stats.snapshot()
+    print(f"🔌 HTTP: {http_stats['requests'] - http_stats_before['requests']} requests, "
+          f"{http_stats['connections_opened'] - http_stats_before['connections_opened']} connections opened, "
+          f"{http_stats['retries'] - http_stats_before['retries']} retries")
+    write_stats = writer.stats()
+    print(f"🔒 Writes: {write_stats['transactions'] - write_stats_before['transactions']} transactions, "
+          f"{write_stats['queue_wait_seconds'] - write_stats_before['queue_wait_seconds']:.3f}s queued in this process, "
+          f"{write_stats['lock_wait_seconds'] - write_stats_before['lock_wait_seconds']:.3f}s waiting for the write lock")
     print(f"📅 Date range covered: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    
+    if fetch_content:
+        fetch_missing_content(DB_PATH, workers=workers)
+
+def refresh_articles(cursor, entries, start_date, end_date):
+    """Overwrite title, subtitle and date of stored articles from re-parsed entries in the date range"""
+    rows = [
+        (entry['title'], entry['subtitle'], entry['date_published'], entry['article_url'])
+        for entry in entries
+        if entry['date_published'] and start_date <= entry['date_published'].date() <= end_date
+    ]
+    if not rows:
+        return 0
+    cursor.executemany("""
+        UPDATE articles SET title = ?, subtitle = ?, date_published = ? WHERE article_url = ?
+    """, rows)
+    return cursor.rowcount
+
+def reparse_archive(days_back=None, config_path=None, source_url=None, since=None, update_existing=False):
+    """Re-run listing extraction over archived pages, without any network access.
+
+    Every archived page of each configured source is parsed with the
+    current config (selectors, parser backend) and stored like a live run
+    would have stored it on the day it was fetched: ``days_back`` is
+    counted back from the fetch date (None keeps every dated item).
+    Identical pages of a source are parsed once. Articles that already
+    exist are skipped unless ``update_existing=True``, in which case their
+    title, subtitle and date are replaced with the re-parsed values.
+    Source HTTP validators and watermarks are left untouched.
+    """
+    CONFIG, parsers = load_config(config_path)
+    initialize_db()
+    archive = get_archive()
+
+    print(f"♻️  Re-parsing archived pages from {archive.root}")
+    print("=" * 80)
+
+    # Oldest fetch of every distinct page per source: its date window is the widest
+    jobs = []
+    for i, (src, parser) in enumerate(zip(CONFIG["updates"], parsers), 1):
+        if source_url and src['url'] != source_url:
+            continue
+        if isinstance(parser, ValueError):
+            print(f"⚠️  Skipping {src['url']} - {parser}")
+            continue
+        seen = set()
+        for _, fetched_at, sha256 in archive.fetches(src['url'], since):
+            if sha256 not in seen:
+                seen.add(sha256)
+                jobs.append((i, src, parser, fetched_at, sha256))
+
+    def parse_archived(job):
+        _, src, parser, _, sha256 = job
+        return parse_listing(archive.load(sha256), src, parser)
+
+    writer = get_writer(DB_PATH)
+    total_new_articles = 0
+    total_updated = 0
+
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix='parse') as parse_pool:
+        # map() keeps archive order, so older pages are stored first
+        for job, parsed in zip(jobs, parse_pool.map(parse_archived, jobs)):
+            src_id, src, _, fetched_at, sha256 = job
+            item_count, entries, _ = parsed
+            end_date = fetched_at.date()
+            start_date = end_date - timedelta(days=days_back) if days_back is not None else date.min
+
+            print(f"\n🗄️  {src['url']} fetched {fetched_at:%Y-%m-%d %H:%M} ({sha256[:12]}): {item_count} items")
+            with writer.transaction() as cursor:
+                if update_existing:
+                    updated = refresh_articles(cursor, entries, start_date, end_date)
+                    total_updated += updated
+                    print(f"✏️  Updated {updated} existing articles")
+                _, new_articles_count = store_items(cursor, src_id, entries, start_date, end_date, days_back)
+            total_new_articles += new_articles_count
+
+    print("\n" + "=" * 80)
+    print(f"✅ Re-parse complete! {len(jobs)} archived pages parsed")
+    print(f"📊 Total new articles added: {total_new_articles}")
+    if update_existing:
+        print(f"✏️  Existing articles updated: {total_updated}")
+    return {'pages': len(jobs), 'new': total_new_articles, 'updated': total_updated}
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape UK government sources for recent articles')
-    parser.add_argument('--days', type=int, default=3, 
-                       help='Number of days back to track (default: 3)')
-    parser.add_argument('--config', type=str, default='config/uk.json',
+    parser.add_argument('command', nargs='?', choices=['scrape', 'reparse'], default='scrape',
+                       help='scrape (default) fetches live; reparse replays the page archive offline')
+    parser.add_argument('--days', type=int, default=None, 
+                       help='Number of days back to track (default: 3; reparse: all)')
+    parser.add_argument('--config', type=str, default=None,
                        help='Path to config file (default: config/uk.json)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Maximum number of sources fetched concurrently (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--force', action='store_true',
+                       help='Ignore stored ETag/Last-Modified and re-parse every source')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only scan each source down to its last seen article (--days applies to new sources)')
+    parser.add_argument('--content', action='store_true',
+                       help='Also fetch the full content of articles that have none yet')
+    parser.add_argument('--no-archive', action='store_true',
+                       help='Do not keep fetched pages in the page archive')
+    parser.add_argument('--source', type=str, default=None,
+                       help='reparse: only replay pages of this source URL')
+    parser.add_argument('--since', type=date.fromisoformat, default=None,
+                       help='reparse: only replay pages fetched on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--update-existing', action='store_true',
+                       help='reparse: also overwrite title, subtitle and date of stored articles')
     
     args = parser.parse_args()
     
-    # Update config path if specified
-    if args.config != 'config/uk.json':
-        global CONFIG
-        with open(args.config, 'r') as f:
-            CONFIG = json.load(f)
+    if args.command == 'reparse':
+        reparse_archive(args.days, config_path=args.config, source_url=args.source, since=args.since,
+                        update_existing=args.update_existing)
+        return
     
-    fetch_and_store(args.days)
+    fetch_and_store(3 if args.days is None else args.days, workers=args.workers, config_path=args.config,
+                    force=args.force, fetch_content=args.content, incremental=args.incremental,
+                    archive_pages=not args.no_archive)
 
 if __name__ == "__main__":
     main()
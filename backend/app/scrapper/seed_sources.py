@@ -1,7 +1,17 @@
 #!/usr/bin/env python3
-import sqlite3
 import json
 import os
+import sys
+from pathlib import Path
+
+# The schema lives in app/data/migrations.py
+sys.path.append(str(Path(__file__).parent.parent))
+try:
+    from app.data.migrations import migrate
+    from app.data.writer import get_writer
+except ImportError:
+    from data.migrations import migrate
+    from data.writer import get_writer
 
 DB_PATH = 'scraper.db'
 
@@ -17,39 +27,37 @@ def seed_sources():
         CONFIG = json.load(f)
     
     # Connect to database
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    migrate(DB_PATH)
     
     print("🌱 Seeding sources into database...")
     
-    for i, src in enumerate(CONFIG['updates'], 1):
-        try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO sources 
-                (id, label, url, type, selector, link_selector, title_selector, subtitle_selector, date_selector)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                i,
-                src['label'],
-                src['url'],
-                src['type'],
-                src.get('selector'),
-                src.get('link_selector'),
-                src.get('title_selector'),
-                src.get('subtitle_selector'),
-                src.get('date_selector')
-            ))
+    with get_writer(DB_PATH).transaction() as cursor:
+        for i, src in enumerate(CONFIG['updates'], 1):
+            try:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO sources 
+                    (id, label, url, type, selector, link_selector, title_selector, subtitle_selector, date_selector)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    i,
+                    src['label'],
+                    src['url'],
+                    src['type'],
+                    src.get('selector'),
+                    src.get('link_selector'),
+                    src.get('title_selector'),
+                    src.get('subtitle_selector'),
+                    src.get('date_selector')
+                ))
             
-            if cursor.rowcount > 0:
-                print(f"✅ Inserted source {i}: {src['label']}")
-            else:
-                print(f"ℹ️  Source {i} already exists: {src['label']}")
+                if cursor.rowcount > 0:
+                    print(f"✅ Inserted source {i}: {src['label']}")
+                else:
+                    print(f"ℹ️  Source {i} already exists: {src['label']}")
                 
-        except Exception as e:
-            print(f"❌ Error inserting source {i}: {e}")
+            except Exception as e:
+                print(f"❌ Error inserting source {i}: {e}")
     
-    conn.commit()
-    conn.close()
     print("✅ Finished seeding sources.")
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: API throughput and latency under concurrent clients.
+
+Runs 1, 16 and 128 concurrent clients (--clients) against a running API,
+each for --duration seconds, and reports requests per second and the
+median and p99 latency. Every client keeps one HTTP connection open and
+requests a mix of article endpoints, including a full-text search that
+takes a few milliseconds of database time per request.
+
+To compare two versions of the API, run it against the same database
+with each of them, e.g. a database generated by bench_indexes.py:
+
+    python benchmarks/bench_indexes.py --rows 200000 --keep
+    python app/data/manage_db.py migrate --db /tmp/bench_indexes_.../scraper.db
+    SCRAPER_DB_PATH=/tmp/bench_indexes_.../scraper.db uvicorn app.api.main:app --port 8000
+    python benchmarks/bench_api_concurrency.py --url http://127.0.0.1:8000/api/v1
+
+Usage:
+    python benchmarks/bench_api_concurrency.py [--url URL] [--clients 1,16,128] [--duration 10]
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+# (path, weight): mostly list pages, some search, stats and health checks
+REQUESTS = [
+    ("/articles?per_page=20", 4),
+    ("/articles?per_page=20&page=50&fields=id,title,date_published,source", 2),
+    ("/articles/recent?limit=10", 2),
+    ("/articles/stats", 1),
+    ("/articles?search=article+1999*&per_page=20", 1),
+    ("/health", 1),
+]
+
+def request_mix():
+    return [path for path, weight in REQUESTS for _ in range(weight)]
+
+def run_client(base, paths, offset, deadline, latencies, errors):
+    """Issue requests over one keep-alive connection until ``deadline``"""
+    url = urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    i = offset
+    while time.perf_counter() < deadline:
+        path = url.path + paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(f"{response.status} {path}")
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(f"{e} {path}")
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+def run_level(base, clients, duration):
+    """Run ``clients`` concurrent clients; return (requests/s, p50, p99, errors)"""
+    paths = request_mix()
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=run_client, args=(base, paths, i, deadline, latencies, errors))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if not latencies:
+        return 0.0, 0.0, 0.0, errors
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return len(latencies) / elapsed, cuts[49], cuts[98], errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the API under concurrent clients')
+    parser.add_argument('--url', default='http://127.0.0.1:8000/api/v1',
+                       help='Base URL of the API (default: http://127.0.0.1:8000/api/v1)')
+    parser.add_argument('--clients', default='1,16,128',
+                       help='Comma-separated numbers of concurrent clients (default: 1,16,128)')
+    parser.add_argument('--duration', type=float, default=10,
+                       help='Seconds to run each concurrency level (default: 10)')
+    parser.add_argument('--warmup', type=float, default=2,
+                       help='Seconds of single-client warm-up (default: 2)')
+    args = parser.parse_args()
+
+    run_level(args.url, 1, args.warmup)
+
+    print(f"{'clients':>8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    print("=" * 50)
+    for clients in (int(n) for n in args.clients.split(',')):
+        throughput, p50, p99, errors = run_level(args.url, clients, args.duration)
+        print(f"{clients:>8} {throughput:>10.1f} {p50 * 1000:>10.1f} {p99 * 1000:>10.1f} {len(errors):>8}")
+        for error in errors[:3]:
+            print(f"    ❌ {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: scrapper.dates versus the original scrape_uk.parse_date.
+
+Parses a corpus of date strings taken from the configured sources
+(fixtures/date_strings.txt), repeated the way a real run sees them, and
+reports throughput and how many strings each implementation understands.
+
+Usage:
+    python benchmarks/bench_dates.py [--repeat 2000]
+"""
+import argparse
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from scrapper.dates import _parse, parse_date, parse_dates
+
+CORPUS_PATH = Path(__file__).parent / "fixtures" / "date_strings.txt"
+
+def legacy_parse_date(date_str):
+    """The original scrape_uk.parse_date, kept verbatim for comparison"""
+    if not date_str:
+        return None
+        
+    date_str_clean = date_str.strip()
+    
+    try:
+        # Format: "11 July 2025" or "11 July 2025 published amendments"
+        if re.match(r'\d{1,2}\s+\w+\s+\d{4}', date_str_clean):
+            date_match = re.search(r'(\d{1,2}\s+\w+\s+\d{4})', date_str_clean)
+            if date_match:
+                date_str_clean = date_match.group(1)
+                return datetime.strptime(date_str_clean, '%d %B %Y')
+        
+        # Format: "2025-07-11" (ISO format)
+        elif re.match(r'\d{4}-\d{2}-\d{2}', date_str_clean):
+            return datetime.fromisoformat(date_str_clean)
+        
+        # Format: "11/07/2025" (DD/MM/YYYY)
+        elif re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str_clean):
+            return datetime.strptime(date_str_clean, '%d/%m/%Y')
+            
+    except Exception:
+        pass
+    
+    return None
+
+def load_corpus():
+    lines = CORPUS_PATH.read_text().splitlines()
+    return [line for line in lines if line and not line.startswith('#')]
+
+def timed(func, data):
+    start = time.perf_counter()
+    func(data)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark date parsing')
+    parser.add_argument('--repeat', type=int, default=2000,
+                       help='Number of times the corpus is repeated (default: 2000)')
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    data = corpus * args.repeat
+
+    print(f"📚 Corpus: {len(corpus)} distinct strings, {len(data)} parses per run")
+    print("=" * 60)
+
+    legacy = timed(lambda d: [legacy_parse_date(s) for s in d], data)
+
+    _parse.cache_clear()
+    uncached = timed(lambda d: [_parse.__wrapped__(s.strip()) for s in d], data)
+
+    _parse.cache_clear()
+    per_item = timed(lambda d: [parse_date(s) for s in d], data)
+
+    _parse.cache_clear()
+    batch = timed(parse_dates, data)
+
+    rows = [
+        ("legacy parse_date", legacy),
+        ("dates, no memo", uncached),
+        ("dates.parse_date", per_item),
+        ("dates.parse_dates", batch),
+    ]
+    for name, seconds in rows:
+        print(f"{name:<20} {seconds * 1000:9.1f} ms  {len(data) / seconds:12,.0f} /s  "
+              f"x{legacy / seconds:5.1f}")
+
+    print("=" * 60)
+    legacy_ok = sum(1 for s in corpus if legacy_parse_date(s))
+    new_ok = sum(1 for s in corpus if parse_date(s))
+    print(f"✅ Parsed by legacy: {legacy_ok}/{len(corpus)}, by dates: {new_ok}/{len(corpus)}")
+    for s in corpus:
+        if not parse_date(s):
+            print(f"   Not a date: '{s}'")
+
+if __name__ == "__main__":
+    main()
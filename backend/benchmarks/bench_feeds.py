@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Atom feed path versus the HTML listing path.
+
+Parses recorded fixtures of the same gov.uk news listing (fixtures/
+govuk_news.html and fixtures/govuk_news.atom) through the scraper's
+parse_listing stage and reports time per page, page size and whether
+both paths extract the same articles.
+
+Usage:
+    python benchmarks/bench_feeds.py [--iterations 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from scrapper.parsers import parser_for
+from scrapper.scrape_uk import parse_listing
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://www.gov.uk/search/news-and-communications"
+
+HTML_SOURCE = {
+    "label": "Gov UK News (HTML)",
+    "url": BASE_URL,
+    "type": "html",
+    "selector": ".gem-c-document-list__item",
+    "link_selector": "a.govuk-link.gem-c-force-print-link-styles.govuk-link--no-underline",
+    "title_selector": "a.govuk-link.gem-c-force-print-link-styles.govuk-link--no-underline",
+    "subtitle_selector": "p.gem-c-document-list__item-description",
+    "date_selector": "time",
+}
+ATOM_SOURCE = {"label": "Gov UK News (Atom)", "url": BASE_URL + ".atom", "type": "atom"}
+
+def bench(src, content, iterations):
+    parser = parser_for(src)
+    parse_listing(content, src, parser)  # Warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        item_count, entries, _ = parse_listing(content, src, parser)
+    elapsed = (time.perf_counter() - start) / iterations
+    return elapsed, item_count, entries
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feed versus HTML parsing')
+    parser.add_argument('--iterations', type=int, default=200,
+                       help='Parses per path (default: 200)')
+    args = parser.parse_args()
+
+    html_content = (FIXTURES / "govuk_news.html").read_bytes()
+    atom_content = (FIXTURES / "govuk_news.atom").read_bytes()
+
+    paths = [("html (html.parser)", HTML_SOURCE, html_content)]
+    try:
+        parser_for({**HTML_SOURCE, "parser": "lxml-direct"})
+        paths.append(("html (lxml-direct)", {**HTML_SOURCE, "parser": "lxml-direct"}, html_content))
+    except ValueError:
+        pass
+    paths.append(("atom feed", ATOM_SOURCE, atom_content))
+
+    print(f"📄 {'path':<20} {'bytes':>8} {'items':>6} {'ms/page':>9} {'speedup':>8}")
+    print("=" * 60)
+    results = {}
+    baseline = None
+    for name, src, content in paths:
+        elapsed, item_count, entries = bench(src, content, args.iterations)
+        baseline = baseline or elapsed
+        results[name] = entries
+        print(f"   {name:<20} {len(content):>8} {item_count:>6} {elapsed * 1000:>9.2f} {baseline / elapsed:>7.1f}x")
+
+    print("=" * 60)
+    html_urls = [(e['article_url'], e['date_published'].date()) for e in results["html (html.parser)"]]
+    atom_urls = [(e['article_url'], e['date_published'].date()) for e in results["atom feed"]]
+    if html_urls == atom_urls:
+        print(f"✅ Both paths extract the same {len(html_urls)} articles and publish dates")
+    else:
+        print("❌ Paths disagree on extracted articles")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: articles queries before and after the index migration.
+
+Generates a database with --rows articles (default 1,000,000) spread over
+20 sources and three years, migrated to schema version 2 (no indexes).
+The queries issued by the API and the content stage are timed and their
+query plans printed; then the database is migrated to version 3 (the
+indexes) and the same queries are run again.
+
+Usage:
+    python benchmarks/bench_indexes.py [--rows 1000000] [--repeat 5] [--keep]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from data.migrations import migrate
+
+SOURCES = 20
+INDEX_VERSION = 3  # Migration that adds the articles indexes
+TODAY = date.today()
+
+ARTICLE_COLUMNS = """articles.id, articles.source_id, articles.article_url, articles.title,
+    articles.subtitle, articles.date_published, articles.date_fetched, articles.content"""
+
+# (name, SQL, parameters) in the shape SQLAlchemy generates for routers/articles.py
+QUERIES = [
+    ("GET /articles (page 1)", f"""
+        SELECT {ARTICLE_COLUMNS} FROM articles JOIN sources ON sources.id = articles.source_id
+        ORDER BY articles.date_published DESC LIMIT 20 OFFSET 0
+    """, ()),
+    ("GET /articles?source_id=7", f"""
+        SELECT {ARTICLE_COLUMNS} FROM articles JOIN sources ON sources.id = articles.source_id
+        WHERE articles.source_id = ?
+        ORDER BY articles.date_published DESC LIMIT 20 OFFSET 0
+    """, (7,)),
+    ("GET /articles?days_back=7", f"""
+        SELECT {ARTICLE_COLUMNS} FROM articles JOIN sources ON sources.id = articles.source_id
+        WHERE articles.date_published >= ?
+        ORDER BY articles.date_published DESC LIMIT 20 OFFSET 0
+    """, (str(TODAY - timedelta(days=7)),)),
+    ("GET /articles?source_id=7 (total)", """
+        SELECT count(*) FROM articles JOIN sources ON sources.id = articles.source_id
+        WHERE articles.source_id = ?
+    """, (7,)),
+    ("GET /articles/recent", f"""
+        SELECT {ARTICLE_COLUMNS} FROM articles ORDER BY articles.date_fetched DESC LIMIT 10
+    """, ()),
+    ("GET /articles/today", f"""
+        SELECT {ARTICLE_COLUMNS} FROM articles WHERE articles.date_published = ?
+        ORDER BY articles.date_fetched DESC
+    """, (f"{TODAY} 00:00:00",)),
+    ("content.py: next batch", """
+        SELECT id, article_url FROM articles WHERE content IS NULL AND id > ? ORDER BY id LIMIT 100
+    """, (0,)),
+]
+
+def generate(db_path, rows):
+    """Create a schema version 2 database with ``rows`` synthetic articles"""
+    migrate(db_path, target=2)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO sources (id, label, url, type) VALUES (?, ?, ?, 'html')",
+        [(i, f"Source {i}", f"https://www.gov.uk/source-{i}") for i in range(1, SOURCES + 1)],
+    )
+    # Newest articles get the highest ids, like a scraper filling the table over time;
+    # one in ten still waits for its content
+    conn.execute(f"""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        INSERT INTO articles (source_id, article_url, title, subtitle, date_published, date_fetched, content)
+        SELECT
+          1 + (i * 7919) % {SOURCES},
+          'https://www.gov.uk/government/news/article-' || i,
+          'Article ' || i,
+          'Summary of article ' || i,
+          datetime(?, '-' || ((? - i) * 1095 / ?) || ' days'),
+          datetime(?, '-' || ((? - i) * 1095 / ?) || ' days', '+' || (i % 86400) || ' seconds'),
+          CASE WHEN i % 10 = 0 THEN NULL ELSE 'Body of article ' || i END
+        FROM n
+    """, (rows, str(TODAY), rows, rows, str(TODAY), rows, rows))
+    conn.commit()
+    conn.close()
+
+def query_plan(conn, sql, params):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def time_query(conn, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def run_queries(db_path, repeat):
+    conn = sqlite3.connect(db_path)
+    results = {}
+    for name, sql, params in QUERIES:
+        conn.execute(sql, params).fetchall()  # Warm the page cache
+        results[name] = (time_query(conn, sql, params, repeat), query_plan(conn, sql, params))
+    conn.close()
+    return results
+
+def print_results(title, results):
+    print(f"\n{title}")
+    print("=" * 80)
+    for name, (elapsed, plan) in results.items():
+        print(f"{name:<36} {elapsed * 1000:>10.2f} ms")
+        for step in plan:
+            print(f"    {step}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark articles queries with and without indexes')
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                       help='Number of generated articles (default: 1000000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Runs per query; the median is reported (default: 5)')
+    parser.add_argument('--keep', action='store_true',
+                       help='Keep the generated database and print its path')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='bench_indexes_')
+    db_path = os.path.join(tmp_dir, 'scraper.db')
+
+    start = time.perf_counter()
+    generate(db_path, args.rows)
+    print(f"Generated {args.rows:,} articles in {time.perf_counter() - start:.1f}s")
+
+    before = run_queries(db_path, args.repeat)
+    print_results("Schema version 2 (no indexes)", before)
+
+    start = time.perf_counter()
+    migrate(db_path, target=INDEX_VERSION)
+    print(f"\nMigrated to schema version {INDEX_VERSION} in {time.perf_counter() - start:.1f}s")
+
+    after = run_queries(db_path, args.repeat)
+    print_results(f"Schema version {INDEX_VERSION} (with indexes)", after)
+
+    print("\nSpeed-up")
+    print("=" * 80)
+    for name in before:
+        print(f"{name:<36} {before[name][0] / max(after[name][0], 1e-9):>10.1f}x")
+
+    if args.keep:
+        print(f"\nDatabase kept at {db_path}")
+    else:
+        os.remove(db_path)
+        os.rmdir(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cursor pagination of GET /articles over page depth.
+
+Generates a database with --rows articles (default 300,000) spread over
+20 sources and three years (as bench_indexes.py does) and migrates it to
+the latest schema. For pages at increasing depths it builds the list
+query the way routers/articles.py does, with the cursor filter of
+api/pagination.after_cursor, and times it with and without source_id.
+The same pages are timed with the plain OR predicate (no upper bound on
+date_published) for comparison.
+
+A page should cost the same at any depth, which takes a query plan that
+seeks the date index to the cursor; the benchmark prints the plans and
+exits with status 1 if the after_cursor query does not.
+
+Usage:
+    python benchmarks/bench_pagination.py [--rows 300000] [--repeat 5] [--keep]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from sqlalchemy import String, and_, desc, or_, type_coerce
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from bench_indexes import SOURCES, generate, query_plan, time_query
+from data.migrations import migrate
+
+PER_PAGE = 20
+DEPTHS = (1_000, 10_000, 100_000)
+SOURCE_ID = 7
+# What the plan of a query seeking to the cursor shows for the date column
+SEEK = "date_published<"
+
+def unbounded_cursor(cursor, model):
+    """The cursor filter without the upper bound, for comparison"""
+    from api.pagination import decode_cursor
+
+    date_published, article_id = decode_cursor(cursor)
+    stored_date = type_coerce(model.date_published, String)
+    return or_(stored_date < date_published, and_(stored_date == date_published, model.id > article_id))
+
+def page_query(cursor, source_id, cursor_filter):
+    """SQL and parameters of a GET /articles page after ``cursor``"""
+    from api.models import Article, Source
+    from api.routers.articles import filter_tier
+    from api.serializers import ARTICLE_FIELDS, article_columns
+
+    query = Session().query(*article_columns(ARTICLE_FIELDS, Article))
+    query = query.outerjoin(Source, Source.id == Article.source_id)
+    query = filter_tier(query, Article, None, source_id).filter(cursor_filter(cursor, Article))
+    statement = query.order_by(desc(Article.date_published), Article.id).limit(PER_PAGE).statement
+    compiled = statement.compile(dialect=sqlite.dialect())
+    return str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)
+
+def cursor_at(conn, depth, source_id):
+    """The cursor after the first ``depth`` articles in list order"""
+    from api.pagination import encode_cursor
+    from datetime import datetime
+
+    where = "WHERE source_id = ?" if source_id else ""
+    row = conn.execute(f"""
+        SELECT date_published, id FROM articles {where}
+        ORDER BY date_published DESC, id LIMIT 1 OFFSET ?
+    """, ((source_id,) if source_id else ()) + (depth - 1,)).fetchone()
+    return encode_cursor(datetime.fromisoformat(row[0]), row[1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cursor pagination over page depth')
+    parser.add_argument('--rows', type=int, default=300_000,
+                       help='Number of generated articles (default: 300000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Runs per page; the median is reported (default: 5)')
+    parser.add_argument('--keep', action='store_true',
+                       help='Keep the generated database and print its path')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='bench_pagination_')
+    db_path = os.path.join(tmp_dir, 'scraper.db')
+    # The API modules read the database path when they are imported
+    os.environ['SCRAPER_DB_PATH'] = db_path
+    from api.pagination import after_cursor
+
+    start = time.perf_counter()
+    generate(db_path, args.rows)
+    migrate(db_path)
+    print(f"Generated and migrated {args.rows:,} articles in {time.perf_counter() - start:.1f}s")
+
+    conn = sqlite3.connect(db_path)
+    seeks = True
+    for source_id in (None, SOURCE_ID):
+        listed = args.rows if source_id is None else args.rows // SOURCES
+        depths = [depth for depth in DEPTHS if depth < listed] + [listed - PER_PAGE]
+        title = f"GET /articles?source_id={source_id}" if source_id else "GET /articles"
+        print(f"\n{title}")
+        print("=" * 80)
+        print(f"{'depth':>10} {'after_cursor':>14} {'without bound':>14}")
+        for depth in depths:
+            cursor = cursor_at(conn, depth, source_id)
+            timings = []
+            for cursor_filter in (after_cursor, unbounded_cursor):
+                sql, params = page_query(cursor, source_id, cursor_filter)
+                conn.execute(sql, params).fetchall()  # Warm the page cache
+                timings.append(time_query(conn, sql, params, args.repeat))
+            print(f"{depth:>10,} {timings[0] * 1000:>11.2f} ms {timings[1] * 1000:>11.2f} ms")
+
+        for name, cursor_filter in (("after_cursor", after_cursor), ("without bound", unbounded_cursor)):
+            plan = query_plan(conn, *page_query(cursor, source_id, cursor_filter))
+            print(f"\nPlan ({name}):")
+            for step in plan:
+                print(f"    {step}")
+            if cursor_filter is after_cursor and not any(SEEK in step for step in plan):
+                seeks = False
+    conn.close()
+
+    if args.keep:
+        print(f"\nDatabase kept at {db_path}")
+    else:
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+    if not seeks:
+        print("\n❌ The after_cursor query does not seek the date index to the cursor")
+        sys.exit(1)
+    print("\n✅ The after_cursor query seeks the date index to the cursor")
+
+if __name__ == "__main__":
+    main()
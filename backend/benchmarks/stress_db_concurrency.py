@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Stress test: API reads against a full scrape on the same database.
+
+Builds a database with --rows existing articles, serves --sources
+synthetic listing pages (--items articles each) and their article pages
+from a local HTTP server, and starts the API on the database. Then a full
+scrape with content fetching runs while a second content-stage run
+competes with it for the write path, and --readers clients read the API
+continuously until the scrape is done.
+
+Reported:
+- the writer's transactions, rollbacks, time queued behind the process's
+  other writes and time waiting for SQLite's write lock (app/data/writer.py)
+- API requests served during the scrape, their median, p99 and maximum
+  latency, and failed requests ("database is locked" counted separately)
+
+Usage:
+    python benchmarks/stress_db_concurrency.py [--rows 100000] [--sources 20] [--items 200] [--readers 8]
+"""
+import argparse
+import contextlib
+import http.client
+import http.server
+import io
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from bench_indexes import generate
+
+# Import the app as a package so the API, scraper and content stage share one writer
+sys.path.append(str(Path(__file__).parent.parent))
+
+READ_PATHS = [
+    "/api/v1/articles?per_page=20",
+    "/api/v1/articles/recent?limit=10",
+    "/api/v1/articles/stats",
+    "/api/v1/articles/today",
+    "/api/v1/articles?search=stress+article&per_page=20",
+]
+
+def listing_page(source, items):
+    """A listing page in the gov.uk document list markup, newest first"""
+    rows = []
+    for item in range(items):
+        published = date.today() - timedelta(days=item * 20 // items)
+        rows.append(
+            f'<li class="item"><a href="/news/{source}/{item}">Stress article {source}-{item}</a>'
+            f'<p>Summary of stress article {source}-{item}</p>'
+            f'<time datetime="{published}">{published:%d %B %Y}</time></li>'
+        )
+    return f"<html><body><main><ul>{''.join(rows)}</ul></main></body></html>".encode()
+
+def article_page(path):
+    paragraphs = "".join(f"<p>Paragraph {i} of {path}.</p>" for i in range(20))
+    return f'<html><body><div class="govuk-govspeak">{paragraphs}</div></body></html>'.encode()
+
+def serve_site(items):
+    """Serve listings at /listing/<n> and articles at /news/...; returns the base URL"""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path.startswith("/listing/"):
+                body = listing_page(int(self.path.rsplit("/", 1)[1]), items)
+            else:
+                body = article_page(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+def write_config(path, site, sources):
+    config = {"country": "UK", "updates": [
+        {
+            "label": f"Stress source {i}", "url": f"{site}/listing/{i}", "type": "html",
+            "selector": "li.item", "link_selector": "a", "title_selector": "a",
+            "subtitle_selector": "p", "date_selector": "time",
+        }
+        for i in range(1, sources + 1)
+    ]}
+    with open(path, "w") as f:
+        json.dump(config, f)
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_api(port):
+    import uvicorn
+    from app.api.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+def read_continuously(port, offset, stop, latencies, failures):
+    """Issue API reads over one keep-alive connection until ``stop`` is set"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    i = offset
+    while not stop.is_set():
+        path = READ_PATHS[i % len(READ_PATHS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            failures.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+            continue
+        if response.status != 200:
+            failures.append(body.decode(errors="replace"))
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+def fill_content(db_path, done):
+    """Keep running the content stage, as a separately started run would, until ``done`` is set"""
+    from app.scrapper.content import fetch_missing_content
+
+    while not done.is_set():
+        if not fetch_missing_content(db_path, limit=100, workers=4)['stored']:
+            time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress the database with API reads during a full scrape')
+    parser.add_argument('--rows', type=int, default=100_000,
+                       help='Articles in the database before the scrape (default: 100000)')
+    parser.add_argument('--sources', type=int, default=20,
+                       help='Number of listing pages to scrape (default: 20)')
+    parser.add_argument('--items', type=int, default=200,
+                       help='New articles per listing page (default: 200)')
+    parser.add_argument('--readers', type=int, default=8,
+                       help='Concurrent API clients (default: 8)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Show the scraper output')
+    parser.add_argument('--keep', action='store_true',
+                       help='Keep the database and print its path')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix='stress_db_')
+    db_path = os.path.join(tmp_dir, 'scraper.db')
+    config_path = os.path.join(tmp_dir, 'sources.json')
+    generate(db_path, args.rows)
+    # The generated articles link to gov.uk; only the scraped ones should be fetched
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE articles SET content = '' WHERE content IS NULL")
+    conn.commit()
+    conn.close()
+    write_config(config_path, serve_site(args.items), args.sources)
+
+    # The API reads the database named here; set before the app is imported
+    os.environ["SCRAPER_DB_PATH"] = db_path
+    from app.data.migrations import migrate
+    from app.data.writer import get_writer
+    from app.scrapper import scrape_uk
+    migrate(db_path)
+    scrape_uk.DB_PATH = db_path
+
+    port = free_port()
+    server = start_api(port)
+    print(f"Database: {args.rows:,} articles; scraping {args.sources} sources x {args.items} articles "
+          f"with content, {args.readers} API readers")
+
+    stop = threading.Event()
+    latencies, failures = [], []
+    readers = [
+        threading.Thread(target=read_continuously, args=(port, i, stop, latencies, failures))
+        for i in range(args.readers)
+    ]
+    for reader in readers:
+        reader.start()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        # A second content run competes with the scrape for the write path
+        done = threading.Event()
+        competitor = threading.Thread(target=fill_content, args=(db_path, done))
+        competitor.start()
+        scrape_uk.fetch_and_store(days_back=30, config_path=config_path, fetch_content=True,
+                                  archive_pages=False)
+        done.set()
+        competitor.join()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for reader in readers:
+        reader.join()
+    server.should_exit = True
+
+    writes = get_writer(db_path).stats()
+    locked = sum('database is locked' in failure for failure in failures)
+    print(f"\nScrape finished in {elapsed:.1f}s")
+    print("\nWrites")
+    print("=" * 60)
+    print(f"Transactions:            {writes['transactions']:>10}")
+    print(f"Rollbacks:               {writes['rollbacks']:>10}")
+    print(f"Queued in the process:   {writes['queue_waits']:>10}")
+    print(f"Total queue wait:        {writes['queue_wait_seconds'] * 1000:>10.1f} ms")
+    print(f"Longest queue wait:      {writes['max_queue_wait_seconds'] * 1000:>10.1f} ms")
+    print(f"Waited for write lock:   {writes['lock_waits']:>10}")
+    print(f"Total lock wait:         {writes['lock_wait_seconds'] * 1000:>10.1f} ms")
+    print(f"Longest lock wait:       {writes['max_lock_wait_seconds'] * 1000:>10.1f} ms")
+    print("\nAPI reads during the scrape")
+    print("=" * 60)
+    print(f"Requests served:         {len(latencies):>10}")
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100)
+        print(f"Median latency:          {cuts[49] * 1000:>10.1f} ms")
+        print(f"p99 latency:             {cuts[98] * 1000:>10.1f} ms")
+        print(f"Max latency:             {max(latencies) * 1000:>10.1f} ms")
+    print(f"Failed requests:         {len(failures):>10}")
+    print(f"'database is locked':    {locked:>10}")
+    for failure in failures[:3]:
+        print(f"    ❌ {failure[:200]}")
+
+    if args.keep:
+        print(f"\nDatabase kept at {db_path}")
+    else:
+        shutil.rmtree(tmp_dir)
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,16 @@
 """
 FastAPI server startup script.
 This script runs the FastAPI application with proper configuration.
+
+By default it starts one process that reloads on code changes. With
+--production it starts --workers processes without the reloader; they
+elect one of them to run the scheduler (see app/scheduler/leader.py).
+Each worker keeps its own /metrics, labelled with its pid (see
+app/api/metrics.py).
 """
 
+import argparse
+import os
 import uvicorn
 import sys
 from pathlib import Path
@@ -11,19 +19,43 @@ from pathlib import Path
 # Add the app directory to Python path
 sys.path.append(str(Path(__file__).parent / "app"))
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Next Step App API server")
+    parser.add_argument("--production", action="store_true",
+                        help="Run several worker processes without auto-reload")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("API_WORKERS", os.cpu_count() or 1)),
+                        help="Worker processes in production mode (default: API_WORKERS or the CPU count)")
+    parser.add_argument("--host", default=os.environ.get("API_HOST", "0.0.0.0"), help="Address to bind to")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", 8000)), help="Port to bind to")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+
     print("Starting Next Step App API server...")
+    if args.production:
+        print(f"Production mode: {args.workers} workers, one of them runs the scheduler")
     print("API Documentation will be available at:")
-    print("  - Swagger UI: http://localhost:8000/docs")
-    print("  - ReDoc: http://localhost:8000/redoc")
-    print("  - Health Check: http://localhost:8000/api/v1/health")
+    print(f"  - Swagger UI: http://localhost:{args.port}/docs")
+    print(f"  - ReDoc: http://localhost:{args.port}/redoc")
+    print(f"  - Health Check: http://localhost:{args.port}/api/v1/health")
     print()
-    
-    uvicorn.run(
-        "app.api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # Auto-reload on code changes
-        log_level="info",
-        access_log=True
-    ) 
\ No newline at end of file
+
+    if args.production:
+        uvicorn.run(
+            "app.api.main:app",
+            host=args.host,
+            port=args.port,
+            workers=max(args.workers, 1),  # Each worker is a separate process
+            log_level="info",
+            access_log=False  # One log line per request is costly at production load
+        )
+    else:
+        uvicorn.run(
+            "app.api.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,  # Auto-reload on code changes
+            log_level="info",
+            access_log=True
+        )
@@ -219,6 +219,25 @@ class ApiService {
     ];
   }
 
+  /**
+   * Subscribe to newly scraped articles, pushed by the backend as they are
+   * stored. EventSource reconnects by itself and resumes where it left
+   * off; onReset is called if too much was missed to catch up, and lists
+   * should then be reloaded. Returns a function that unsubscribes.
+   */
+  subscribeToArticles(
+    onArticles: (articles: Article[]) => void,
+    onReset?: () => void
+  ): () => void {
+    const source = new EventSource(`${this.baseUrl}/events`);
+    source.addEventListener('articles', (event) => {
+      const data: { articles: Article[] } = JSON.parse((event as MessageEvent).data);
+      onArticles(data.articles);
+    });
+    source.addEventListener('reset', () => onReset?.());
+    return () => source.close();
+  }
+
   /**
    * Health check
    */